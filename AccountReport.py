@@ -15,48 +15,44 @@
 #                   3) Adjusted indent for account names
 # 2024-12-20 V1.7 - Added code to set folder name if the command line parameter is empty
 # 2025-01-22 V1.8 - Added code to set workbook print parameters
+# 2026-10-18 V1.9 - 1) Walk the account tree depth-first with pruned subtrees
+#                      instead of recursing by hand
+#                   2) Get balances from the account's date index
+#                   3) Convert gnucashxml Amounts to float for the workbook cells
+# 2026-10-18 V1.10 - Get balance and shares from the cached balances of the book
+# 2026-10-18 V1.11 - 1) Share price from the GnuCash price database instead of balance / shares
+#                   2) Added market value column and total (page scale 70 to fit)
+# 2026-10-18 V1.12 - Write the spreadsheet a row at a time with ReportWriter
+# 2026-10-18 V1.13 - Moved the report into functions so BatchReports can run it on a shared book;
+#                   main() runs it stand-alone as before
 #
-Program_Version = "V1.8"
+Program_Version = "V1.13"
 
 # System libraries
-from datetime import date
+from datetime import date, timedelta
 from pathlib import Path
 import argparse
-# Openpyxl libraries
-from openpyxl import Workbook
-from openpyxl.styles import DEFAULT_FONT, Font, Alignment
+# Report spreadsheet
+from ReportWriter import ReportWriter, Column, Styled
 # GnuCash library
 import gnucashxml
 
-# Set up and get any parameter
-parser = argparse.ArgumentParser()
-# Directory or Folder (optional)
-parser.add_argument('directory', nargs='?', default=str(Path.home())+"/GnuCash/Reports/")
-args = parser.parse_args()
-#print("args.directory=", args.directory)
-
 # CONSTANTS & Global Variables
 # Location of GnuCash file (book)
 GnuCash_Book = "/home/dave/GnuCash/NagyFamily2024.gnucash"
 # Get current date and set other variables
 today = date.today()
 File_DatePrefix = "{:4d}-{:02d}-{:02d}".format(today.year, today.month, today.day)
-# XLSX folder
-if args.directory is None or args.directory == "":
-    XLSX_Folder = str(Path.home())+"/GnuCash/Reports/"
-else:
-    XLSX_Folder = args.directory
-#print("Report to be written to '{}'.".format(XLSX_Folder))
-
-# Keep track of accounts already processed
-processed_list = []
-# Row number in spreadsheet
-global sheet_row
+# Default XLSX folder
+XLSX_Folder = str(Path.home())+"/GnuCash/Reports/"
+
+# Account types (with their subaccounts) left out of the report
+excluded_types = ["EXPENSE", "INCOME", "EQUITY"]
 # Total value
-global total_value
-total_value=0
+total_value = 0
+# Total market value
+total_market = 0
 # Accounts processed
-global total_processed
 total_processed = 0
 
 # Format printed dollar amount
@@ -66,144 +62,114 @@ def formatDollarAmt(amt):
     else:
         return "${:,.2f}".format(amt)
 
-# Process children recursively
-def process_child(lvl, acc):
-    global sheet_row
+# Process one account below a top-level account; add its row to the report rows
+def process_account(lvl, child, rows, market_values):
+    global total_value
+    global total_market
+    child_type = child.actype
+    child_value, child_quantity = child.balance(today, recursive=False)
+    for split in child.splits_between(today + timedelta(days=1), None):
+        print("--Skipping Future Trans in {} on {} ({}) for {}"
+              .format(child.name, split.transaction.date.date(), split.transaction.description, formatDollarAmt(split.value)))
+    indent_space = "{:{}} ".format(" ", lvl)
+    total_value += child_value
+    # Market value of stocks & mutual funds, cost if there is no price
+    child_market = market_values.get(child)
+    if child_market is None:
+        child_market = child_value
+    total_market += child_market
+    if child_type in ["STOCK", "MUTUAL"] and child_quantity == 0:
+        #print("--Skipping '{}' in '{}' account '{}' - 0 shares.".format(child.name, child_type, child.parent.name))
+        pass
+    elif child_value == 0 and len(child.children) == 0:
+        #print("--Skipping '{}' in '{}' account '{}' - $0 value & 0 children.".format(child.name, child_type, child.parent.name))
+        pass
+    elif child_value != 0:
+        #print("{:64} {:>12,.2f}".format(indent_space + child.name, child_value))
+        if child_type in ["STOCK", "MUTUAL"] and child_quantity != 0:
+            rows.append([None, child.name, child_value, child_quantity, child_market / child_quantity, child_market])
+        else:
+            rows.append([None, child.name, child_value, None, None, child_market])
+    elif child_value == 0 and lvl > 0 and child_type not in ["STOCK", "MUTUAL"]:
+        #print("{:64}".format(indent_space + child.name))
+        rows.append([indent_space + child.name])
+
+# Get the report rows of all accounts from the book
+def account_summary(book):
     global total_value
+    global total_market
     global total_processed
-    total_processed += 1
-    child_type = ""
-    processed_list.append(acc.name)
-    lvl += 1
-    for child in acc.children:
-        if acc.actype != "EXPENSE" and acc.name+"-"+child.name not in processed_list:
-            child_value = 0
-            child_quantity = 0
-            for split in child.splits:
-                if split.transaction.date.date() <= today:
-                    child_value += split.value
-                    child_quantity += split.quantity
-                    child_type = split.account.actype
-                else:
-                    print("--Skipping Future Trans in {} on {} ({}) for {}"
-                          .format(child.name, split.transaction.date.date(), split.transaction.description, formatDollarAmt(split.value)))
-            indent_space = "{:{}} ".format(" ", lvl)
-            total_value += child_value
-            if child_type in ["STOCK", "MUTUAL"] and child_quantity == 0:
-                #print("--Skipping '{}' in '{}' account '{}' - 0 shares.".format(child.name, child_type, acc.name))
-                pass
-            elif child_value == 0 and len(child.children) == 0:
-                #print("--Skipping '{}' in '{}' account '{}' - $0 value & 0 children.".format(child.name, child_type, acc.name))
-                pass
-            elif child_value != 0:
-                #print("{:64} {:>12,.2f}".format(indent_space + child.name, child_value))
-                ws["B{}".format(sheet_row)] = child.name
-                ws["C{}".format(sheet_row)] = child_value
-                ws["C{}".format(sheet_row)].number_format = '"$"#,##0.00_);[Red]("$"#,##0.00)'
-                if child_type in ["STOCK", "MUTUAL"] and child_quantity != 0:
-                    ws["D{}".format(sheet_row)] = child_quantity
-                    ws["D{}".format(sheet_row)].number_format = '###,##0.0000'
-                    ws["E{}".format(sheet_row)] = child_value / child_quantity
-                    ws["E{}".format(sheet_row)].number_format = '"$"#,##0.0000'
-                sheet_row += 1
-            elif child_value == 0 and lvl > 0 and child_type not in ["STOCK", "MUTUAL"]:
-                #print("{:64}".format(indent_space + child.name))
-                ws["A{}".format(sheet_row)] = indent_space + child.name
-                sheet_row += 1
-            processed_list.append(child.name+"-"+acc.name)
-            if len(acc.children) > 0:
-                process_child(lvl, child)
+    total_value = 0
+    total_market = 0
+    total_processed = 0
+    rows = []
+    # Market value of every stock & mutual fund account from the price database
+    market_values = book.market_values(today)
+
+    # Depth-first order puts every account right below its parent; depth 1 are
+    # the top-level accounts, which only get a progress message
+    for account, depth in book.traverse(prune=lambda acc: acc.actype in excluded_types):
+        if depth == 1 and len(account.children) > 0:
+            print("Processing '{}' from '{}' with {} children".format(account.name, account.parent.name, len(account.children)))
+            total_processed += 1
+        elif depth > 1:
+            process_account(depth - 1, account, rows, market_values)
+            total_processed += 1
 
-# End of Functions
+    rows.append([])
+    rows.append([None, Styled("TOTAL VALUE", "heading"), Styled(total_value, "money_total"), None, None,
+                 Styled(total_market, "money_total")])
+
+    print("\nCompleted processing {} accounts.".format(total_processed))
+    return rows
 
 # Create spreadsheet and workbook
-XLSX_filename = XLSX_Folder + "{}_AccountSummary.xlsx".format(File_DatePrefix)
-
-wb = Workbook()
-ws = wb.active
-ws.title = "GnuCash Accounts"
-DEFAULT_FONT.name = "FreeSans"
-DEFAULT_FONT.size = 10
-# Set page margins
-ws.page_margins.left = 0.5
-ws.page_margins.right = 0.5
-ws.page_margins.top = 0.7
-ws.page_margins.bottom = 1
-ws.page_margins.header = 0.5
-ws.page_margins.footer = 0.5
-# Set paper orientation, size, and scale to fit columns to page
-ws.page_setup.orientation = ws.ORIENTATION_PORTRAIT
-ws.page_setup.paperSize = ws.PAPERSIZE_LETTER
-ws.page_setup.scale = 83
-# Set print titles for every page
-ws.print_title_rows = '1:2'
-# Set printed page footer
-ws.oddFooter.left.text = "Page &P of &N"
-ws.evenFooter.left.text = "Page &P of &N"
-ws.oddFooter.right.text = "&[Date]"
-ws.evenFooter.right.text = "&[Date]"
-
-# Set column widths
-ws.column_dimensions['A'].width = 12    # Date & Account Tree
-ws.column_dimensions['B'].width = 48    # Account Name
-ws.column_dimensions['C'].width = 20    # Value
-ws.column_dimensions['D'].width = 16    # Quantity (Stocks & Mutual Funds)
-ws.column_dimensions['E'].width = 16    # $/Share (Stocks & Mutual Funds)
-
-sheet_row = 1
-# Create Title Row
-Todays_date = "{:02d}/{:02d}/{:4d}".format(today.month, today.day, today.year)
-ws["A{}".format(sheet_row)] = "GnuCash Account Summary - Current to {}".format(Todays_date)
-ws["A{}".format(sheet_row)].font = Font(bold=True)
-ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=5)
-top_left_cell = ws['A1']
-top_left_cell.alignment = Alignment(horizontal='center', vertical='center')
-
-#ws["E{}".format(sheet_row)] = Todays_date#ws["E{}".format(sheet_row)].font = Font(bold=True)
-#ws["E{}".format(sheet_row)].alignment = Alignment(horizontal='center')
-
-sheet_row += 1
-ws["B{}".format(sheet_row)] = "Account"
-ws["B{}".format(sheet_row)].font = Font(bold=True)
-ws["B{}".format(sheet_row)].alignment = Alignment(horizontal='center')
-
-ws["C{}".format(sheet_row)] = "Balance"
-ws["C{}".format(sheet_row)].font = Font(bold=True)
-ws["C{}".format(sheet_row)].alignment = Alignment(horizontal='center')
-
-ws["D{}".format(sheet_row)] = "Shares"
-ws["D{}".format(sheet_row)].font = Font(bold=True)
-ws["D{}".format(sheet_row)].alignment = Alignment(horizontal='center')
-
-ws["E{}".format(sheet_row)] = "Share $"
-ws["E{}".format(sheet_row)].font = Font(bold=True)
-ws["E{}".format(sheet_row)].alignment = Alignment(horizontal='center')
-
-sheet_row += 1
-
-book = gnucashxml.from_filename(GnuCash_Book)
-
-for account, children, splits in book.walk():
-
-    if account.actype not in ["EXPENSE", "INCOME", "EQUITY"] and account.name != "Root Account":
-        level = 0
-        if account.name+"-"+account.parent.name not in processed_list and len(account.children) > 0:
-            print("Processing '{}' from '{}' with {} children".format(account.name, account.parent.name, len(account.children)))
-            process_child(level, account)
-            processed_list.append(account.name + "-" + account.parent.name)
-        #else:
-        #    print("Skipping '{}' from '{}' - Processed earlier & 0 children".format(account.name, account.parent.name))
+def Create_Workbook(rows, XLSX_filename):
+    # Set column widths & styles
+    report = ReportWriter(XLSX_filename, "GnuCash Accounts",
+                          [Column("", 12, "text"),                # Date & Account Tree
+                           Column("Account", 48, "text"),         # Account Name
+                           Column("Balance", 20, "money"),        # Value
+                           Column("Shares", 16, "quantity"),      # Quantity (Stocks & Mutual Funds)
+                           Column("Share $", 16, "price"),        # $/Share (Stocks & Mutual Funds)
+                           Column("Market Value", 20, "money")],  # Market Value
+                          scale=70, print_title_rows='1:2')
+
+    # Create Title Row
+    Todays_date = "{:02d}/{:02d}/{:4d}".format(today.month, today.day, today.year)
+    report.title_row("GnuCash Account Summary - Current to {}".format(Todays_date))
+    report.heading_row()
+
+    report.rows(rows)
+
+    report.save()
+    print("\nXLSX spreadsheet '{}' was created successfully.".format(XLSX_filename))
+
+# Run the report on a loaded book; return its output stages as (name, function) pairs
+def account_report(book, folder=XLSX_Folder):
+    rows = account_summary(book)
+    XLSX_filename = folder + "{}_AccountSummary.xlsx".format(File_DatePrefix)
+    return [("xlsx", lambda: Create_Workbook(rows, XLSX_filename))]
 
-sheet_row += 1
-ws["B{}".format(sheet_row)] = "TOTAL VALUE"
-ws["B{}".format(sheet_row)].font = Font(bold=True)
-ws["B{}".format(sheet_row)].alignment = Alignment(horizontal='center')
+# End of Functions
 
-ws["C{}".format(sheet_row)] = total_value
-ws["C{}".format(sheet_row)].font = Font(bold=True)
-ws["C{}".format(sheet_row)].number_format = '"$"#,##0.00_);[Red]("$"#,##0.00)'
+def main():
+    # Set up and get any parameter
+    parser = argparse.ArgumentParser()
+    # Directory or Folder (optional)
+    parser.add_argument('directory', nargs='?', default=XLSX_Folder)
+    args = parser.parse_args()
+    #print("args.directory=", args.directory)
+    # XLSX folder
+    if args.directory is None or args.directory == "":
+        folder = XLSX_Folder
+    else:
+        folder = args.directory
+    #print("Report to be written to '{}'.".format(folder))
 
-print("\nCompleted processing {} accounts.".format(total_processed))
+    book = gnucashxml.from_filename(GnuCash_Book)
+    for stage_name, stage in account_report(book, folder):
+        stage()
 
-wb.save(XLSX_filename)
-print("\nXLSX spreadsheet '{}' was created successfully.".format(XLSX_filename))
\ No newline at end of file
+if __name__ == "__main__":
+    main()
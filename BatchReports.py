@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+#----------------------------------------------------------------------------------------------
+# Run several reports from one load of the GnuCash book
+#
+# The book is read once and shared by every report.  Each report first collects its data
+# from the book (one report at a time, on the main thread), then its outputs - spreadsheets,
+# text reports and emails - are written in worker threads while the next report is collected.
+# Load, collect and output times are printed at the end.
+#
+# Usage: BatchReports.py [book_file] [--jobs account,tax,imbalance] [--directory folder]
+#                        [--threads n]
+#
+# --- Change History ---
+# Program version 0
+# 2026-10-18 V1   - New
+# 2026-10-18 V1.1 - Exit with sys.exit() so the failure status also works without site
+#
+Program_Version = "V1.1"
+
+# System libraries
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+# GnuCash library
+import gnucashxml
+# Reports
+import AccountReport
+import TaxTransactionReport
+import ImbalanceReport
+
+# CONSTANTS
+# Location of GnuCash file (book)
+GnuCash_Book = AccountReport.GnuCash_Book
+# Reports by job name: function(book, folder) returning the report's output stages
+Jobs = {
+    "account":   lambda book, folder: AccountReport.account_report(book, folder),
+    "tax":       lambda book, folder: TaxTransactionReport.tax_report(
+                     book, report_folder=folder, workbook_folder=folder),
+    "imbalance": lambda book, folder: ImbalanceReport.imbalance_report(book),
+}
+# END OF CONSTANTS
+
+# Run one output stage and return its elapsed time
+def run_stage(stage):
+    start = time.perf_counter()
+    stage()
+    return time.perf_counter() - start
+
+def main():
+    # Set up and get any parameter
+    parser = argparse.ArgumentParser(description="Run several GnuCash reports from one load of the book.")
+    parser.add_argument('book_file', nargs='?', default=GnuCash_Book)
+    parser.add_argument('--jobs', default=",".join(Jobs),
+                        help="comma separated reports to run: {}".format(", ".join(Jobs)))
+    parser.add_argument('--directory', default=AccountReport.XLSX_Folder,
+                        help="folder the reports are written to")
+    parser.add_argument('--threads', type=int, default=4,
+                        help="number of threads writing the report outputs")
+    args = parser.parse_args()
+
+    job_names = [name.strip() for name in args.jobs.split(",") if name.strip()]
+    for name in job_names:
+        if name not in Jobs:
+            parser.error("unknown job '{}' (choose from {})".format(name, ", ".join(Jobs)))
+
+    print("Batch Reports {} - loading '{}'".format(Program_Version, args.book_file))
+    batch_start = time.perf_counter()
+    book = gnucashxml.from_filename(args.book_file)
+    load_time = time.perf_counter() - batch_start
+
+    timings = []    # (job, stage, seconds or None, error)
+    outputs = []    # (job, stage, future)
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        for name in job_names:
+            start = time.perf_counter()
+            try:
+                stages = Jobs[name](book, args.directory)
+            except Exception as error:
+                timings.append((name, "collect", None, error))
+                continue
+            timings.append((name, "collect", time.perf_counter() - start, None))
+            for stage_name, stage in stages:
+                outputs.append((name, stage_name, executor.submit(run_stage, stage)))
+
+        for name, stage_name, future in outputs:
+            try:
+                timings.append((name, stage_name, future.result(), None))
+            except BaseException as error:
+                timings.append((name, stage_name, None, error))
+    total_time = time.perf_counter() - batch_start
+
+    print("\n{:<12} {:<10} {:>10}".format("JOB", "STAGE", "SECONDS"))
+    print("{:<12} {:<10} {:>10.3f}".format("book", "load", load_time))
+    failed = 0
+    for name, stage_name, seconds, error in timings:
+        if error is None:
+            print("{:<12} {:<10} {:>10.3f}".format(name, stage_name, seconds))
+        else:
+            failed += 1
+            print("{:<12} {:<10} {:>10}  {}: {}".format(name, stage_name, "FAILED",
+                                                       type(error).__name__, error))
+    print("{:<12} {:<10} {:>10.3f}".format("total", "", total_time))
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -41,17 +41,22 @@ def process_account(par, acc):
 def process_split(spl):
     #print("--SPLIT: Acct:{:32} Value:{:9.2F} #Slots:{:4}"
     #      .format(split.account.name, split.value, len(split.slots)))
-    process_transaction(spl.account.name, spl.transaction)
+    process_transaction(spl)
 
-def process_transaction(acc_name, trans):
+def process_transaction(spl):
+    trans = spl.transaction
     #print("----TRX: Date:", trans.date.strftime("%m/%d/%Y"), "Num:", trans.num, "Desc:", trans.description, "#Splits:", len(trans.splits))
     #print("----Trans: Date:{:10} Num:{} Desc:{:32} #Splits:{:4}".format(trans.date.strftime("%m/%d/%Y"), trans.num, trans.description, len(trans.splits)))
-    print("ACC_NAME:", acc_name)
-    spl_cnt = len(trans.splits)
+    counter_account = spl.counter_account
+    print("ACC_NAME:", spl.account.name, " AMT:", spl.value,
+          " COUNTER-ACCT:", formatNone(counter_account.name if counter_account is not None else None))
+    # Net of the transaction in each of the other accounts
+    net_by_account = trans.net_by_account()
+    spl_cnt = len(spl.counterparts)
     spl_ctr = 0
-    for spl in trans.splits:
+    for other in spl.counterparts:
         print("--TRX-SPLIT", spl_ctr, "/", spl_cnt, ": DATE:", trans.date.strftime("%m/%d/%Y"), " NUM:", trans.num, " DESC:", trans.description,
-              " SPL-ACCT:", spl.account.name, "  AMT:", spl.value)
+              " SPL-ACCT:", other.account.name, "  AMT:", other.value, "  ACCT-NET:", net_by_account[other.account])
         spl_ctr += 1
 
 # --------------------------------------------------------------------------------
@@ -63,3 +68,4 @@ for account, children, splits in book.walk():
         print("ROOT.{:48} PARENT: {:32} TYPE: {:16} #CHILDREN:{:3} #SPLITS:{:4}".format(account.name, formatNone(account.parent.name), formatNone(account.actype), len(children), len(splits)))
         if account.name in test_list:
             for split in account.splits:
+                process_split(split)
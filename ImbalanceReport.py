@@ -6,9 +6,13 @@
 # --- Change History ---
 # Program version 0
 # 2024-12-24 V1   - New
+# 2026-10-18 V1.1 - Look up the account with find_account; load only its transactions
+# 2026-10-18 V1.2 - Count the account's splits with a book query
+# 2026-10-18 V1.3 - Moved the check into functions so BatchReports can run it on a shared book;
+#                   main() runs it stand-alone as before
 
 
-Program_Version = "V1.0"
+Program_Version = "V1.3"
 
 # System imports
 import sys
@@ -18,40 +22,58 @@ import ssl
 # GnuCash Structure import
 import gnucashxml
 
-# Import email user id and password
-sys.path.insert(0, '<your home>/Python/_Configs')
-import _EMail
+# Email configuration directory (holds _EMail.py with the user id and password)
+email_config_folder = '<your home>/Python/_Configs'
 
 # CONSTANTS & Globals
 account_to_check = "Imbalance-USD"
 # Get current date and set other variables
 today = date.today()
 notify_email = ["<your email>" "<and others>"]
+book_file = "<your gnucash book file>.gnucash"
 # END OF CONSTANTS
 
 # -------------
 
-book = gnucashxml.from_filename("<your gnucash book file".gnucash)
+# Count the transactions in the account and build the notification message
+def check_account(book, account_name=account_to_check):
+    found_splits = list(book.query().accounts(account_name).splits())
+    if len(found_splits) > 0:
+        return "Warning: {} Transactions were found in '{}' account".format(len(found_splits), account_name)
+    else:
+        return "No Transactions Found in '{}' account".format(account_name)
 
+# Send the notification email
+def send_notification(notify_msg, account_name=account_to_check):
+    # Import email user id and password
+    if email_config_folder not in sys.path:
+        sys.path.insert(0, email_config_folder)
+    import _EMail
 
-for account, children, splits in book.walk():
-    if account.name == account_to_check:
-        if len(splits) > 0:
-            notify_msg = "Warning: {} Transactions were found in '{}' account".format(len(splits), account_to_check)
-        else:
-            notify_msg = "No Transactions Found in '{}' account".format(account_to_check)
+    # Setup Email connection and message
+    port = 587  # For starttls
+    smtp_server = "smtp.gmail.com"
+    message = """Subject: '{}' Status
 
+""".format(account_name)
+    context = ssl._create_unverified_context()
+    # Send notification email
+    message = message + notify_msg
+    with smtplib.SMTP(smtp_server, port) as server:
+        server.starttls(context=context)
+        server.login(_EMail.email_user, _EMail.email_password)
+        server.sendmail(_EMail.email_user, notify_email, message)
 
-# Setup Email connection and message
-port = 587  # For starttls
-smtp_server = "smtp.gmail.com"
-message = """Subject: '{}' Status
+# Run the check on a loaded book; return its output stages as (name, function) pairs
+def imbalance_report(book, account_name=account_to_check):
+    notify_msg = check_account(book, account_name)
+    print(notify_msg)
+    return [("email", lambda: send_notification(notify_msg, account_name))]
 
-""".format(account_to_check)
-context = ssl._create_unverified_context()
-# Send notification email
-message = message + notify_msg
-with smtplib.SMTP(smtp_server, port) as server:
-    server.starttls(context=context)
-    server.login(_EMail.email_user, _EMail.email_password)
-    server.sendmail(_EMail.email_user, notify_email, message)
+def main():
+    book = gnucashxml.from_filename(book_file, accounts=[account_to_check])
+    for stage_name, stage in imbalance_report(book):
+        stage()
+
+if __name__ == "__main__":
+    main()
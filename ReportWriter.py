@@ -0,0 +1,175 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Write report spreadsheets one row at a time
+#
+# Shared by the report scripts.  The workbook is created in openpyxl's write-only mode,
+# so rows are streamed to the file as they are appended and memory use does not grow
+# with the number of rows.  Cell formats are named styles registered once per workbook;
+# each cell only refers to one by name.
+#
+# Usage:
+#   columns = [Column("DATE", 12, "center"), Column("AMOUNT", 16, "money")]
+#   with ReportWriter(filename, "Sheet title", columns) as report:
+#       report.title_row("Report title")
+#       report.heading_row()
+#       report.rows(generator_of_row_lists)
+# A value in a row may be given as Styled(value, "style") to override its column's style.
+#
+# --- Change History ---
+# Program version 0
+# 2026-10-18 V1   - New
+#
+Program_Version = "V1"
+
+# System libraries
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal
+# Openpyxl libraries
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle
+from openpyxl.utils import get_column_letter
+# GnuCash library
+import gnucashxml
+
+# CONSTANTS
+# Font of every cell
+Font_Name = "FreeSans"
+Font_Size = 10
+# Number formats
+Money_Format = '"$"#,##0.00_);[Red]("$"#,##0.00)'
+Quantity_Format = '###,##0.0000'
+Price_Format = '"$"#,##0.0000'
+Date_Format = 'mm/dd/yyyy'
+
+# Named styles: name -> (bold, horizontal alignment, number format)
+Styles = {
+    "text":        (False, "left",   None),
+    "center":      (False, "center", None),
+    "right":       (False, "right",  None),
+    "money":       (False, None,     Money_Format),
+    "quantity":    (False, None,     Quantity_Format),
+    "price":       (False, None,     Price_Format),
+    "date":        (False, "center", Date_Format),
+    "title":       (True,  "center", None),
+    "heading":     (True,  "center", None),
+    "bold":        (True,  None,     None),
+    "total_label": (True,  "right",  None),
+    "money_total": (True,  None,     Money_Format),
+}
+
+# A report column: heading text, width in characters, and style of its data cells
+Column = namedtuple("Column", "heading width style")
+# A cell value with its own style
+Styled = namedtuple("Styled", "value style")
+
+
+# Convert a value for a cell: gnucashxml Amounts and Decimals become floats
+def cell_value(value):
+    if isinstance(value, (gnucashxml.Amount, Decimal)):
+        return float(value)
+    return value
+
+
+class ReportWriter(object):
+
+    def __init__(self, filename, sheet_title, columns, scale=None, print_title_rows=None,
+                 orientation="portrait"):
+        self.filename = filename
+        self.columns = columns
+        self.row_number = 0
+
+        self.wb = Workbook(write_only=True)
+        for name, (bold, horizontal, number_format) in Styles.items():
+            style = NamedStyle(name=name)
+            style.font = Font(name=Font_Name, size=Font_Size, bold=bold)
+            if horizontal is not None:
+                style.alignment = Alignment(horizontal=horizontal)
+            if number_format is not None:
+                style.number_format = number_format
+            self.wb.add_named_style(style)
+        self.ws = self.wb.create_sheet(sheet_title)
+
+        # Column widths must be set before the first row is written
+        for number, column in enumerate(columns, 1):
+            self.ws.column_dimensions[get_column_letter(number)].width = column.width
+
+        # Set page margins
+        self.ws.page_margins.left = 0.5
+        self.ws.page_margins.right = 0.5
+        self.ws.page_margins.top = 0.7
+        self.ws.page_margins.bottom = 1
+        self.ws.page_margins.header = 0.5
+        self.ws.page_margins.footer = 0.5
+        # Set paper orientation, size, and scale to fit columns to page
+        self.ws.page_setup.orientation = orientation
+        self.ws.page_setup.paperSize = "1"    # Letter
+        if scale is not None:
+            self.ws.page_setup.scale = scale
+        # Set print titles for every page
+        if print_title_rows is not None:
+            self.ws.print_title_rows = print_title_rows
+        # Set printed page footer
+        self.ws.oddFooter.left.text = "Page &P of &N"
+        self.ws.evenFooter.left.text = "Page &P of &N"
+        self.ws.oddFooter.right.text = "&[Date]"
+        self.ws.evenFooter.right.text = "&[Date]"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Only save a complete report
+        if exc_type is None:
+            self.save()
+
+    @property
+    def next_row(self):
+        """Number of the row the next append writes"""
+        return self.row_number + 1
+
+    def row(self, values, styles=None):
+        """Append one row; styles overrides the column styles where it is not None"""
+        cells = []
+        for number, value in enumerate(values):
+            if value is None:
+                cells.append(None)
+                continue
+            style = styles[number] if styles is not None and number < len(styles) else None
+            if isinstance(value, Styled):
+                value, style = value
+            if style is None:
+                style = self.columns[number].style if number < len(self.columns) else "text"
+                # Dates need a date format to show as dates
+                if isinstance(value, date) and Styles[style][2] is None:
+                    style = "date"
+            cell = WriteOnlyCell(self.ws, value=cell_value(value))
+            cell.style = style
+            cells.append(cell)
+        self.ws.append(cells)
+        self.row_number += 1
+
+    def rows(self, row_values):
+        """Append every row of an iterable (or generator) of value lists"""
+        for values in row_values:
+            self.row(values)
+
+    def blank_row(self):
+        self.ws.append([])
+        self.row_number += 1
+
+    def title_row(self, text, merge=True):
+        """Append a bold, centered title, merged over all columns"""
+        self.row([text], ["title"])
+        if merge and len(self.columns) > 1:
+            self.ws.merged_cells.add("A{0}:{1}{0}".format(
+                self.row_number, get_column_letter(len(self.columns))))
+
+    def heading_row(self):
+        """Append the column headings"""
+        self.row([column.heading or None for column in self.columns],
+                 ["heading"] * len(self.columns))
+
+    def save(self):
+        self.wb.save(self.filename)
@@ -6,17 +6,27 @@
 # Program version 0
 # 2024-12-24 V1   - New
 # 2025-01-22 V1.1 - Added code to set workbook print parameters
-
-Program_Version = "V1.1"
+# 2026-10-18 V1.2 - Convert gnucashxml Amounts to float for the workbook cells
+# 2026-10-18 V1.3 - Load only the tax-related accounts' transactions in the report period
+# 2026-10-18 V1.4 - Select the splits with a book query instead of walking all accounts
+# 2026-10-18 V1.5 - Write the workbook a row at a time with ReportWriter
+# 2026-10-18 V1.6 - Moved the report into functions so BatchReports can run it on a shared book;
+#                   main() runs it stand-alone as before
+# 2026-10-18 V1.7 - Paying account is the split's counter account, found by account rather than
+#                   by name; the amount is the split's own value
+# 2026-10-18 V1.8 - Paying account and amount are selected as before V1.7 again, so the report
+#                   is unchanged for negative splits and transfers within an account
+# 2026-10-18 V1.9 - Report and workbook failures raise ReportError instead of calling exit(), so
+#                   BatchReports reports them; main() still exits with code 2 or 3
+
+Program_Version = "V1.9"
 
 # System imports
 import sys
 from datetime import date
 from pathlib import Path
-# Openpyxl imports
-#import openpyxl
-from openpyxl import Workbook
-from openpyxl.styles import DEFAULT_FONT, Font, Alignment
+# Report spreadsheet
+from ReportWriter import ReportWriter, Column, Styled
 # GnuCash Structure import
 import gnucashxml
 
@@ -34,16 +44,8 @@ Workbook_Folder_name = my_home+"/GnuCash/Reports/"
 book_file = "/home/dave/GnuCash/NagyFamily2024.gnucash"
 # END OF CONSTANTS
 
-# Accounts to report
-TaxRelatedAccounts_list = []
 # Name of file containing list of accounts
 account_list_file = "/home/dave/Python/GnuCash/TaxRelatedAccounts.txt"
-# Open file and read each entry;  Add each to the list
-with open(account_list_file) as f:
-    for line in f:
-        TaxRelatedAccounts_list.append(line.strip())
-f.close()
-#print("List of accounts:", TaxRelatedAccounts_list)
 
 # Determine start and end dates for report
 # if running in Jan to April, start date is 1/1 of prior year and end date is 12/31 of prior year
@@ -55,15 +57,15 @@ else:
     start_date = date(today.year,1,1)
     end_date = today
 report_title = "Tax-Related Transactions from {} through {} - {}".format(start_date.strftime("%m/%d/%Y"), end_date.strftime("%m/%d/%Y"), Program_Version)
-print("Report of", report_title)
-print("Accounts to inspect are in '{}'".format(account_list_file))
-print("")
-
-# Initialize transaction list
-Found_Transactions_list = []
 
 # -------------
 
+# A report output that could not be written; code is the program's exit code
+class ReportError(Exception):
+    def __init__(self, message, code):
+        super(ReportError, self).__init__(message)
+        self.code = code
+
 # Format printed dollar amount
 def formatDollarAmt(amt):
     if amt < 0:
@@ -87,34 +89,41 @@ def formatNone(val):
     else:
         return val
 
-# Process split
-def process_split(spl):
-    if start_date <= spl.transaction.date.date() <= end_date:
-        process_transaction(spl.account.name, spl.transaction)
-
-# Process transaction and save in list
-def process_transaction(acc_name, trans):
+# Read the accounts to report from a file, one account name per line
+def read_account_list(filename):
+    TaxRelatedAccounts_list = []
+    # Open file and read each entry;  Add each to the list
+    with open(filename) as f:
+        for line in f:
+            TaxRelatedAccounts_list.append(line.strip())
+    #print("List of accounts:", TaxRelatedAccounts_list)
+    return TaxRelatedAccounts_list
+
+# Process a split of a tax-related account and save its transaction in list
+# The paying account is the last split of another account (by name) with a negative value and the
+# amount is the last positive split of an account with this name, so negative splits and transfers
+# within the account report as they always have
+def process_split(spl, Found_Transactions_list):
+    trans = spl.transaction
+    acc_name = spl.account.name
     save_account_name = acc_name
     save_value = 0
-    for spl in trans.splits:
-        if spl.account.name != acc_name and spl.value < 0:
-            save_account_name = spl.account.name
-        if spl.account.name == acc_name and spl.value > 0:
-            save_value = spl.value
+    for trans_spl in trans.splits:
+        if trans_spl.account.name != acc_name and trans_spl.value < 0:
+            save_account_name = trans_spl.account.name
+        if trans_spl.account.name == acc_name and trans_spl.value > 0:
+            save_value = trans_spl.value
     Found_Transactions_list.append([acc_name, save_account_name, trans.date.strftime("%m/%d/%Y"), formatNone(trans.num), formatNone(trans.description),
                           save_value])
 
 # Create a text report
-def Create_Report(l):
-    report_filename = Report_Folder_name + Generic_File_name + ".txt"
+def Create_Report(l, report_filename=Report_Folder_name + Generic_File_name + ".txt"):
 
     # noinspection PyBroadException
     try:
         report_file = open(report_filename, 'w')
-    except:
-        print("Failed to open report file: {}".format(report_filename))
-        print("Program fails with code 2")
-        exit(2)
+    except OSError as error:
+        raise ReportError("Failed to open report file: {}".format(report_filename), 2) from error
 
     report_file.write("{:^90}\n\n".format(report_title))
     # Column headings
@@ -147,146 +156,93 @@ def Create_Report(l):
     report_file.close()
     print("Report Successfully Saved to '{}'".format(report_filename))
 
-# Create spreadsheet of data
-def Create_Workbook(l):  # Open workbook
-
-    Workbook_filename =Workbook_Folder_name + Generic_File_name + ".xlsx"
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Tax Related Transactions"
-    DEFAULT_FONT.name = "FreeSans"
-    DEFAULT_FONT.size = 10
-    # Create workbook title
-    ws["A1"] = report_title
-    ws["A1"].font = Font(bold=True)
-    ws['A1'].alignment = Alignment(horizontal='center')
-    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=6)
-    # Set page margins
-    ws.page_margins.left = 0.5
-    ws.page_margins.right = 0.5
-    ws.page_margins.top = 0.7
-    ws.page_margins.bottom = 1
-    ws.page_margins.header = 0.5
-    ws.page_margins.footer = 0.5
-
-    # Set paper orientation, size, and scale to fit columns to page
-    ws.page_setup.orientation = ws.ORIENTATION_PORTRAIT
-    ws.page_setup.paperSize = ws.PAPERSIZE_LETTER
-    ws.page_setup.scale = 74
-    # Set print titles for every page
-    ws.print_title_rows = '1:3'
-    # Set printed page footer
-    ws.oddFooter.left.text = "Page &P of &N"
-    ws.evenFooter.left.text = "Page &P of &N"
-    ws.oddFooter.right.text = "&[Date]"
-    ws.evenFooter.right.text = "&[Date]"
-
-    # Set column widths
-    ws.column_dimensions['A'].width = 32
-    ws.column_dimensions['B'].width = 28
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 6
-    ws.column_dimensions['E'].width = 32
-    ws.column_dimensions['F'].width = 16
-
-    # Create Heading Row
-    ws['A3'] = "TAX ACCOUNT"
-    ws['A3'].font = Font(bold=True)
-    ws['A3'].alignment = Alignment(horizontal='center')
-
-    ws['B3'] = "PAY ACCOUNT"
-    ws['B3'].font = Font(bold=True)
-    ws['B3'].alignment = Alignment(horizontal='center')
-
-    ws['C3'] = "DATE"
-    ws['C3'].font = Font(bold=True)
-    ws['C3'].alignment = Alignment(horizontal='center')
-
-    ws['D3'] = "NUM"
-    ws['D3'].font = Font(bold=True)
-    ws['D3'].alignment = Alignment(horizontal='center')
-
-    ws['E3'] = "DESCRIPTION"
-    ws['E3'].font = Font(bold=True)
-    ws['E3'].alignment = Alignment(horizontal='center')
-
-    ws['F3'] = "AMOUNT"
-    ws['F3'].font = Font(bold=True)
-    ws['F3'].alignment = Alignment(horizontal='center')
-
-    sum_start_row = 4
-    sheet_row = 4
-
+# Generate the workbook rows: the transactions of each tax account followed by their total
+def Workbook_Rows(l, report):
+    sum_start_row = report.next_row
     prior_tax_acct = ""
-    total_value = 0
 
     for tax_acct, pay_acct, trx_date, trx_num, trx_desc, trx_value in l:
         if prior_tax_acct == "":
             prior_tax_acct = tax_acct
 
         if tax_acct != prior_tax_acct:
-            ws["E{}".format(sheet_row)] = "TOTAL:"
-            ws["E{}".format(sheet_row)].alignment = Alignment(horizontal='right')
-            ws["E{}".format(sheet_row)].font = Font(bold=True)
-            ws["F{}".format(sheet_row)] = "=SUM(F{}:F{})".format(sum_start_row, sheet_row - 1)
-            ws["F{}".format(sheet_row)].number_format = '"$"#,##0.00_);[Red]("$"#,##0.00)'
-            ws["F{}".format(sheet_row)].font = Font(bold=True)
-            sum_start_row = sheet_row + 2
-            sheet_row += 2
-            total_value = 0
+            yield [None, None, None, None, Styled("TOTAL:", "total_label"),
+                   Styled("=SUM(F{}:F{})".format(sum_start_row, report.next_row - 1), "money_total")]
+            yield []
+            sum_start_row = report.next_row
             prior_tax_acct = tax_acct
 
-        if tax_acct == prior_tax_acct:
-            ws["A{}".format(sheet_row)] = tax_acct
-            ws["A{}".format(sheet_row)].alignment = Alignment(horizontal='left')
-            ws["B{}".format(sheet_row)] = pay_acct
-            ws["B{}".format(sheet_row)].alignment = Alignment(horizontal='left')
-            ws["C{}".format(sheet_row)] = trx_date
-            ws["C{}".format(sheet_row)].alignment = Alignment(horizontal='center')
-            ws["D{}".format(sheet_row)] = formatNone(trx_num)
-            ws["D{}".format(sheet_row)].alignment = Alignment(horizontal='center')
-            ws["E{}".format(sheet_row)] = trx_desc
-            ws["E{}".format(sheet_row)].alignment = Alignment(horizontal='left')
-            ws["F{}".format(sheet_row)] = trx_value
-            ws["F{}".format(sheet_row)].number_format = '"$"#,##0.00_);[Red]("$"#,##0.00)'
-            sheet_row += 1
-            total_value += trx_value
-            prior_tax_acct = tax_acct
+        yield [tax_acct, pay_acct, trx_date, formatNone(trx_num), trx_desc, trx_value]
 
-    ws["E{}".format(sheet_row)] = "TOTAL:"
-    ws["E{}".format(sheet_row)].alignment = Alignment(horizontal='right')
-    ws["E{}".format(sheet_row)].font = Font(bold=True)
-    ws["F{}".format(sheet_row)] = "=SUM(F{}:F{})".format(sum_start_row, sheet_row - 1)
-    ws["F{}".format(sheet_row)].number_format = '"$"#,##0.00_);[Red]("$"#,##0.00)'
-    ws["F{}".format(sheet_row)].font = Font(bold=True)
+    yield [None, None, None, None, Styled("TOTAL:", "total_label"),
+           Styled("=SUM(F{}:F{})".format(sum_start_row, report.next_row - 1), "money_total")]
 
-    try:
-        wb.save(Workbook_filename)
-    except:
-        print("Could not save XLSX file: {}".format(sys.exc_info()[0]))
-        exit(3)
+# Create spreadsheet of data
+def Create_Workbook(l, Workbook_filename=Workbook_Folder_name + Generic_File_name + ".xlsx"):  # Open workbook
 
-    print("Workbook successfully saved to '{}'".format(Workbook_filename))
+    # Set column widths & styles
+    report = ReportWriter(Workbook_filename, "Tax Related Transactions",
+                          [Column("TAX ACCOUNT", 32, "text"),
+                           Column("PAY ACCOUNT", 28, "text"),
+                           Column("DATE", 12, "center"),
+                           Column("NUM", 6, "center"),
+                           Column("DESCRIPTION", 32, "text"),
+                           Column("AMOUNT", 16, "money")],
+                          scale=74, print_title_rows='1:3')
 
-#-------------
+    # Create workbook title & heading row
+    report.title_row(report_title)
+    report.blank_row()
+    report.heading_row()
 
-book = gnucashxml.from_filename(book_file)
+    report.rows(Workbook_Rows(l, report))
 
-for account, children, splits in book.walk():
-    if len(splits) > 0 and account.name in TaxRelatedAccounts_list:
-        #print("ROOT.{:48} PARENT: {:32} TYPE: {:16} #CHILDREN:{:3} #SPLITS:{:4}".format(account.name, formatNone(account.parent.name), formatNone(account.actype), len(children), len(splits)))
-        for split in account.splits:
-            process_split(split)
-
-# After finding transactions, sort, then summarize
+    try:
+        report.save()
+    except Exception as error:
+        raise ReportError("Could not save XLSX file: {}".format(type(error)), 3) from error
 
-# Sort by tax-account name then by date
-Found_Transactions_list.sort(key=lambda x: (x[0], x[2]))
+    print("Workbook successfully saved to '{}'".format(Workbook_filename))
 
-# Create text report
-Create_Report(Found_Transactions_list)
+# Find the transactions of the tax-related accounts in the report period
+def find_transactions(book, TaxRelatedAccounts_list):
+    Found_Transactions_list = []
+    for split in book.query().accounts(*TaxRelatedAccounts_list).between(start_date, end_date).splits():
+        process_split(split, Found_Transactions_list)
+
+    # Sort by tax-account name then by date
+    Found_Transactions_list.sort(key=lambda x: (x[0], x[2]))
+    return Found_Transactions_list
+
+# Run the report on a loaded book; return its output stages as (name, function) pairs
+def tax_report(book, TaxRelatedAccounts_list=None, report_folder=Report_Folder_name,
+               workbook_folder=Workbook_Folder_name):
+    if TaxRelatedAccounts_list is None:
+        TaxRelatedAccounts_list = read_account_list(account_list_file)
+    found = find_transactions(book, TaxRelatedAccounts_list)
+    return [("text", lambda: Create_Report(found, report_folder + Generic_File_name + ".txt")),
+            ("xlsx", lambda: Create_Workbook(found, workbook_folder + Generic_File_name + ".xlsx"))]
 
-# Create workbook
-Create_Workbook(Found_Transactions_list)
+#-------------
 
+def main():
+    print("Report of", report_title)
+    print("Accounts to inspect are in '{}'".format(account_list_file))
+    print("")
+    TaxRelatedAccounts_list = read_account_list(account_list_file)
+
+    # Load only the tax-related accounts' transactions in the report period
+    book = gnucashxml.from_filename(book_file, accounts=TaxRelatedAccounts_list,
+                                    start_date=start_date, end_date=end_date)
+
+    # Create text report and workbook
+    for stage_name, stage in tax_report(book, TaxRelatedAccounts_list):
+        try:
+            stage()
+        except ReportError as error:
+            print(error)
+            print("Program fails with code {}".format(error.code))
+            sys.exit(error.code)
+
+if __name__ == "__main__":
+    main()
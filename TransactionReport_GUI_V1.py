@@ -10,18 +10,32 @@
 # 2024-12-13 V1.2 - Minor text changes on report title & headings;
 #                   Added part of selected account name to the file names;
 #                   Fixed issue with an empty description field
-
-Program_Version = "V1.2"
+# 2026-10-18 V1.3 - Find the selected account through the book's account index
+#                   and get the prior balance and date range from its date index;
+#                   Convert gnucashxml Amounts to float for the workbook cells
+# 2026-10-18 V1.4 - Reload the book before each request so changes saved in GnuCash
+#                   since startup are included; only changed transactions are updated
+# 2026-10-18 V1.5 - Select the transactions in the date range with a book query
+# 2026-10-18 V1.6 - Load the book on a background thread so the window opens at once;
+#                   show the load progress and enable the account selection when done
+# 2026-10-18 V1.7 - Write the workbook a row at a time with ReportWriter
+# 2026-10-18 V1.8 - Added a search box to find transactions by description, num or memo
+#                   across the book; the search index is built while the book loads
+# 2026-10-18 V1.9 - Reload the book on the loader thread before a request, with the
+#                   same progress bar and error reporting as the initial load
+# 2026-10-18 V1.10- Prior balance and listed transactions come from the same query of the selected
+#                   account and its sub-accounts, so the opening balance matches the rows
+
+Program_Version = "V1.10"
 
 # System imports
 import sys
 import os
 import re
-from datetime import date
+from datetime import date, timedelta
 from pathlib import Path
-# Openpyxl imports
-from openpyxl import Workbook
-from openpyxl.styles import DEFAULT_FONT, Font, Alignment
+# Report spreadsheet
+from ReportWriter import ReportWriter, Column
 # GUI imports
 from PyQt5 import QtCore, QtWidgets, uic
 from PyQt5.QtWidgets import (QApplication, QTableWidgetItem, QHeaderView)
@@ -86,6 +100,25 @@ def process_account(acc):
             #print("process_account: Child: ", ch.name, " #Children:", len(ch.children), " # Splits:", len(ch.splits))
             process_account(ch)
 
+# Build the sorted list of accounts to select from
+def build_account_list(book):
+    account_list.clear()
+    for account, children, splits in book.walk():
+        #print("initialize: Account:",account.name, " # Children: ", len(account.children), " # Splits:", len(account.splits))
+        if account.actype in candidate_types:
+            if len(account.children) > 0:
+                for child in account.children:
+                    #print("initialize: Child: ", child.name, " # Splits:", len(child.splits))
+                    process_account(child)
+            elif len(account.splits) > 0:
+                #print("initialize: Account:", account.name, " # Children: ", len(account.children), " # Splits:", len(account.splits))
+                process_account(account)
+    return sorted(set(account_list))
+
+# Amount of a transaction: the total of its debit splits
+def transaction_amount(trx):
+    return sum(spl.value for spl in trx.splits if spl.value > 0)
+
 # Remove blanks and special characters from a string
 def clean_string(s):
     s = re.sub(r'\W+', '', s)  # remove non-word characters (blanks, punctuation, etc.)
@@ -97,29 +130,51 @@ def clean_string(s):
 # Initialize balance variables
 prior_balance = 0
 prior_balance_date = date(2000,1,1)
+# What the listed transactions are from, for report titles
+report_subject = ""
 # Initialize transaction list
 #transaction_list = []
 # End of Global variables
 
-print("initialize: Open Book & Get all Accounts")
-book = gnucashxml.from_filename(book_file)
+# Book and account list, set by the BookLoader thread
+book = None
 account_list = []
-# Build account list
-for account, children, splits in book.walk():
-    #print("initialize: Account:",account.name, " # Children: ", len(account.children), " # Splits:", len(account.splits))
-    if account.actype in candidate_types:
-        if len(account.children) > 0:
-            for child in account.children:
-                #print("initialize: Child: ", child.name, " # Splits:", len(child.splits))
-                process_account(child)
-        elif len(account.splits) > 0:
-            #print("initialize: Account:", account.name, " # Children: ", len(account.children), " # Splits:", len(account.splits))
-            process_account(account)
-
-account_list = sorted(set(account_list))
-
-print("initialize: Book is open and account list complete and sorted")
-#print("initialize: account_list:", account_list)
+
+# QT Class - Load the book and its account list in the background
+class BookLoader(QtCore.QThread):
+    progress = QtCore.pyqtSignal(int)            # Percent of the book file read
+    loaded = QtCore.pyqtSignal(object, object)   # Book, sorted account list
+    failed = QtCore.pyqtSignal(str)              # Error message
+
+    def __init__(self, filename, book=None, parent=None):
+        super(BookLoader, self).__init__(parent)
+        self.filename = filename
+        self.book = book        # Reload this book instead of opening the file
+        self.percent = -1
+
+    def report_progress(self, done, total):
+        # Only signal the GUI when the percentage changes
+        percent = int(100 * done / total) if total else 0
+        if percent != self.percent:
+            self.percent = percent
+            self.progress.emit(percent)
+
+    def run(self):
+        try:
+            if self.book is None:
+                print("initialize: Open Book & Get all Accounts")
+                loaded_book = gnucashxml.from_filename(self.filename, progress=self.report_progress,
+                                                       search_index=True)
+            else:
+                # Pick up any changes saved in GnuCash since the book was loaded
+                loaded_book = self.book
+                loaded_book.reload(progress=self.report_progress)
+            accounts = build_account_list(loaded_book)
+        except Exception as e:
+            self.failed.emit("Could not load book: {}".format(e))
+            return
+        print("initialize: Book is open and account list complete and sorted")
+        self.loaded.emit(loaded_book, accounts)
 
 # Open front page window
 Ui_MainWindow, QtBaseClass = uic.loadUiType("TransactionReport.ui")
@@ -136,7 +191,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.Title_label.setText("GnuCash Transaction Report " + Program_Version)
 
         # Set actions & initial status for buttons
-        self.Process_button.clicked.connect(self.Process_Request)
+        self.Process_button.clicked.connect(self.Process_Clicked)
         self.Report_Save_button.clicked.connect(self.Create_Report)
         self.Report_Save_button.setEnabled(False)
         self.Print_Report_button.clicked.connect(self.Print_Report)
@@ -145,8 +200,22 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.Workbook_Save_button.setEnabled(False)
         self.Exit_button.clicked.connect(self.exitNow)
         
-        # Load Account selection
-        self.Account_box.addItems(account_list)
+        # Search box for transactions across the book
+        self.Search_entry = QtWidgets.QLineEdit()
+        self.Search_entry.setPlaceholderText("Search descriptions, nums and memos")
+        self.Search_entry.returnPressed.connect(self.Search_Clicked)
+        self.Prefix_checkbox = QtWidgets.QCheckBox("Word starts")
+        self.Prefix_checkbox.setToolTip("Match the start of each word instead of any part of the text")
+        self.Search_button = QtWidgets.QPushButton("Search")
+        self.Search_button.clicked.connect(self.Search_Clicked)
+        search_toolbar = self.addToolBar("Search")
+        search_toolbar.addWidget(self.Search_entry)
+        search_toolbar.addWidget(self.Prefix_checkbox)
+        search_toolbar.addWidget(self.Search_button)
+
+        # Account selection and search are enabled once the book is loaded
+        self.Enable_Requests(False)
+        self.pending_request = None
 
         # Set screen fields to initial values
         self.Book_File_label.setText(book_file)
@@ -154,6 +223,76 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         #self.Report_File_entry.setText(Report_Folder_name + Generic_File_name+".txt")
         #self.Workbook_File_entry.setText(Workbook_Folder_name + Generic_File_name + ".xlsx")
 
+        # Show load progress in the status bar
+        self.Load_progressBar = QtWidgets.QProgressBar()
+        self.Load_progressBar.setRange(0, 100)
+        self.statusBar().showMessage("Loading book...")
+        self.statusBar().addPermanentWidget(self.Load_progressBar)
+
+        # Load the book in the background
+        self.Start_Loader(BookLoader(book_file))
+
+    def Start_Loader(self, loader):
+        self.loader = loader
+        self.loader.progress.connect(self.Load_progressBar.setValue)
+        self.loader.loaded.connect(self.Book_Loaded)
+        self.loader.failed.connect(self.Book_Failed)
+        self.loader.start()
+
+    def Enable_Requests(self, enabled):
+        self.Account_box.setEnabled(enabled)
+        self.Process_button.setEnabled(enabled)
+        self.Search_entry.setEnabled(enabled)
+        self.Search_button.setEnabled(enabled)
+
+    def Reload_Book(self, request):
+        # Reload the book in the background, then run the request
+        self.pending_request = request
+        self.Enable_Requests(False)
+        self.Load_progressBar.setValue(0)
+        self.statusBar().setStyleSheet("")
+        self.statusBar().showMessage("Reloading book...")
+        self.statusBar().addPermanentWidget(self.Load_progressBar)
+        self.Load_progressBar.show()
+        self.Start_Loader(BookLoader(book_file, book=book))
+
+    def Book_Loaded(self, loaded_book, accounts):
+        global book
+        global account_list
+        book = loaded_book
+        account_list = accounts
+
+        # Load Account selection, keeping the current one after a reload
+        sel_account = self.Account_box.currentText()
+        self.Account_box.clear()
+        self.Account_box.addItems(account_list)
+        if sel_account in account_list:
+            self.Account_box.setCurrentText(sel_account)
+        self.Enable_Requests(True)
+        self.statusBar().removeWidget(self.Load_progressBar)
+        self.statusBar().showMessage("Book loaded with {} accounts to select".format(len(account_list)), 5000)
+
+        request, self.pending_request = self.pending_request, None
+        if request is not None:
+            request()
+
+    def Book_Failed(self, message):
+        self.pending_request = None
+        self.statusBar().removeWidget(self.Load_progressBar)
+        self.statusBar().setStyleSheet("color: red;")
+        self.statusBar().showMessage(message)
+        # After a failed reload the book loaded before is still usable
+        if book is not None:
+            self.Enable_Requests(True)
+
+    def Process_Clicked(self):
+        self.Reload_Book(self.Process_Request)
+
+    def Search_Clicked(self):
+        if self.Search_entry.text().strip() == "":
+            return
+        self.Reload_Book(self.Search_Request)
+
     def PopulateTable(self, trx_list):
 
         # Set titles
@@ -192,30 +331,39 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.Report_Save_button.setEnabled(True)
         self.Workbook_Save_button.setEnabled(True)
 
-    def Process_Request(self):
-        global prior_balance
-        global prior_balance_date
-        global transaction_list
-
+    def Clear_Table(self):
         # Clear Table, list and other values
         self.Transaction_List.clear()
         self.Transaction_List.setRowCount(0)
         self.Transaction_List.clearContents()
         self.Transaction_List.clearSpans()
-
         transaction_list.clear()
+
+    def Process_Request(self):
+        global prior_balance
+        global prior_balance_date
+        global report_subject
+
+        self.Clear_Table()
         prior_balance = 0
         prior_balance_date = date(2000,1,1)
 
         sel_account = self.Account_box.currentText()
+        report_subject = "Account '" + sel_account + "'"
         sel_start = self.Start_dateEdit.date().toPyDate()
         sel_end = self.End_dateEdit.date().toPyDate()
 
-        for acc2, child2, split2 in book.walk():
-            if acc2.name == sel_account:
-                #print("Processing:", account.name)
-                for split3 in acc2.splits:
-                    self.process_split(split3, sel_start, sel_end)
+        # The selected account and its sub-accounts; splits before the start date only
+        # contribute to the prior balance
+        selection = book.query().subtree(sel_account)
+        prior_end = sel_start - timedelta(days=1)
+        prior_splits = list(selection.between(None, prior_end))
+        if prior_splits:
+            prior_balance = gnucashxml.Amount.sum([split2.value for split2 in prior_splits])
+            prior_balance_date = prior_splits[-1].transaction.date.date()
+        for split3 in selection.between(sel_start, sel_end):
+            transaction_list.append(
+                [split3.transaction.date.date(), split3.transaction.num, split3.transaction.description, split3.value])
 
         if not self.No_Prior_Balance_checkbox.isChecked():
             # Add prior balance to list
@@ -235,20 +383,30 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
 
         self.PopulateTable(transaction_list)
 
-    # noinspection PyMethodMayBeStatic
-    def process_split(self, split, sta_date, end_date):
-        global prior_balance
-        global prior_balance_date
-        global transaction_list
-        if split.transaction.date.date() < sta_date:
-            prior_balance += split.value
-            #print("process_split: Prior Balance:", prior_balance)
-            if split.transaction.date.date() > prior_balance_date:
-                prior_balance_date = split.transaction.date.date()
-        elif split.transaction.date.date() >= sta_date and split.transaction.date.date() <= end_date:
-            transaction_list.append(
-                [split.transaction.date.date(), split.transaction.num, split.transaction.description, split.value])
-            #print("process_split: Add ", split.transaction.date.date(), split.transaction.num, split.transaction.description, split.value)
+    def Search_Request(self):
+        global report_subject
+
+        search_text = self.Search_entry.text().strip()
+        if search_text == "":
+            return
+        self.Clear_Table()
+
+        sel_start = self.Start_dateEdit.date().toPyDate()
+        sel_end = self.End_dateEdit.date().toPyDate()
+        report_subject = "Search '" + search_text + "'"
+
+        # Transactions in the date range whose description, num or memo matches
+        for trx in book.search(search_text, prefix=self.Prefix_checkbox.isChecked()):
+            if sel_start <= trx.date.date() <= sel_end:
+                transaction_list.append([trx.date.date(), trx.num, trx.description, transaction_amount(trx)])
+        self.statusBar().showMessage("{} transactions found".format(len(transaction_list)), 5000)
+
+        search_str = clean_string(search_text)
+        search_File_name = "{}_Search_{}_Transactions".format(File_DatePrefix, search_str[:16])
+        self.Report_File_entry.setText(Report_Folder_name + search_File_name + ".txt")
+        self.Workbook_File_entry.setText(Workbook_Folder_name + search_File_name + ".xlsx")
+
+        self.PopulateTable(transaction_list)
 
     def Create_Report(self):
         self.Report_Msg_label.clear()
@@ -266,7 +424,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             self.PrintReport_checkbox.setChecked(False)
             return
 
-        title = "Transaction Report from Account'" + self.Account_box.currentText() + "'"
+        title = "Transaction Report from " + report_subject
         report_file.write("{:^112}\n\n".format(title))
         # Column headings
         report_file.write("{:^12} {:^6} {:80} {:^14}\n"
@@ -296,57 +454,26 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
 
         Workbook_filename = self.Workbook_File_entry.text()
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Transaction Report"
-        DEFAULT_FONT.name = "FreeSans"
-        DEFAULT_FONT.size = 10
-
-        # Set column widths
-        ws.column_dimensions['A'].width = 12
-        ws.column_dimensions['B'].width = 10
-        ws.column_dimensions['C'].width = 80
-        ws.column_dimensions['D'].width = 16
-
-        # Create workbook title
-        ws["A1"] = "Transaction Report from '" + self.Account_box.currentText() + "'"
-        ws["A1"].font = Font(bold=True)
-        ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=4)
+        # Set column widths & styles
+        report = ReportWriter(Workbook_filename, "Transaction Report",
+                              [Column("DATE", 12, "date"),
+                               Column("NUM", 10, "center"),
+                               Column("DESCRIPTION", 80, "text"),
+                               Column("AMOUNT", 16, "money")])
 
-        # Create Heading Row
-        ws['A3'] = "DATE"
-        ws['A3'].font = Font(bold=True)
-        ws['A3'].alignment = Alignment(horizontal='center')
-
-        ws['B3'] = "NUM"
-        ws['B3'].font = Font(bold=True)
-        ws['B3'].alignment = Alignment(horizontal='center')
-
-        ws['C3'] = "DESCRIPTION"
-        ws['C3'].font = Font(bold=True)
-        ws['C3'].alignment = Alignment(horizontal='center')
-
-        ws['D3'] = "AMOUNT"
-        ws['D3'].font = Font(bold=True)
-        ws['D3'].alignment = Alignment(horizontal='center')
-
-        sheet_row = 4
+        # Create workbook title & heading row
+        report.title_row("Transaction Report from " + report_subject)
+        report.blank_row()
+        report.heading_row()
 
         #transactionList, count = self.fetchRows(int(self.TransactionCount.text()))
 
-        for trx_date, trx_num, trx_desc, trx_amt in transaction_list:
-            ws["A{}".format(sheet_row)] = trx_date
-            ws["A{}".format(sheet_row)].alignment = Alignment(horizontal='center')
-            ws["B{}".format(sheet_row)] = formatZeroNone(trx_num)
-            ws["B{}".format(sheet_row)].alignment = Alignment(horizontal='center')
-            ws["C{}".format(sheet_row)] = trx_desc
-            ws["D{}".format(sheet_row)] = trx_amt
-            ws["D{}".format(sheet_row)].number_format = '"$"#,##0.00_);[Red]("$"#,##0.00)'
-            sheet_row += 1
+        report.rows([trx_date, formatZeroNone(trx_num), trx_desc, trx_amt]
+                    for trx_date, trx_num, trx_desc, trx_amt in transaction_list)
 
         # noinspection PyBroadException
         try:
-            wb.save(Workbook_filename)
+            report.save()
         except:
             self.Workbook_Msg_label.setStyleSheet("background-color: yellow; color: red;")
             self.Workbook_Msg_label.setText("Could not save XLSX file: {}".format(sys.exc_info()[0]))
@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Compare Amounts with the plain Decimal division gnucashxml used before
+#
+# Times parsing "num/denom" strings, plain totals of all values (a += loop
+# and sum() or Amount.sum), and report-style balance totals: the balance of
+# every account as of a date, computed the way the report scripts do (loop
+# over the splits, check the date, +=) with Decimal values and with
+# Amounts, and with Amounts through Amount.sum and Account.balance_as_of.
+#
+# Usage: bench_amounts.py [number of splits]
+
+import datetime
+import decimal
+import random
+import sys
+import timeit
+
+from repo_module import import_gnucashxml
+gnucashxml = import_gnucashxml()
+
+
+def parse_decimal(numstring):
+    # The former gnucashxml._parse_number
+    num, denum = numstring.split("/")
+    return decimal.Decimal(num) / decimal.Decimal(denum)
+
+
+def make_accounts(count, parse_number):
+    rnd = random.Random(42)
+    accounts = [gnucashxml.Account(name="Account {}".format(i), guid=str(i), actype="BANK")
+                for i in range(50)]
+    for i in range(count):
+        date = datetime.datetime(2015 + rnd.randrange(10), 1 + rnd.randrange(12), 1 + rnd.randrange(28),
+                                 10, 59, tzinfo=datetime.timezone.utc)
+        trn = gnucashxml.Transaction(guid=str(i), date=date)
+        value = parse_number("{}/100".format(rnd.randrange(-10 ** 7, 10 ** 7)))
+        account = accounts[i % len(accounts)]
+        split = gnucashxml.Split(guid=str(i), value=value, quantity=value, account=account, transaction=trn)
+        trn.splits.append(split)
+        account.splits.append(split)
+    return accounts
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rnd = random.Random(42)
+    strings = ["{}/100".format(rnd.randrange(-10 ** 7, 10 ** 7)) for i in range(count)]
+    as_of = datetime.date(2020, 6, 30)
+    decimal_accounts = make_accounts(count, parse_decimal)
+    amount_accounts = make_accounts(count, gnucashxml._parse_number)
+
+    decimal_values = [parse_decimal(s) for s in strings]
+    amount_values = [gnucashxml._parse_number(s) for s in strings]
+
+    def total_loop(values):
+        total = 0
+        for value in values:
+            total += value
+        return total
+
+    if gnucashxml.Amount.sum(amount_values) != sum(decimal_values):
+        raise SystemExit("Totals differ")
+
+    def balances_decimal_loop():
+        for account in decimal_accounts:
+            total = 0
+            for split in account.splits:
+                if split.transaction.date.date() <= as_of:
+                    total += split.value
+
+    def balances_amount_loop():
+        # The report scripts' loop, on Amounts
+        for account in amount_accounts:
+            total = 0
+            for split in account.splits:
+                if split.transaction.date.date() <= as_of:
+                    total += split.value
+
+    def balances_amount_sum():
+        for account in amount_accounts:
+            gnucashxml.Amount.sum([split.value for split in account.splits
+                                   if split.transaction.date.date() <= as_of])
+
+    def balances_index_first():
+        # Includes building each account's date index
+        for account in amount_accounts:
+            account._split_index = None
+            account.balance_as_of(as_of)
+
+    def balances_index():
+        for account in amount_accounts:
+            account.balance_as_of(as_of)
+
+    for dec, amt in zip(decimal_accounts, amount_accounts):
+        expected = sum(s.value for s in dec.splits if s.transaction.date.date() <= as_of)
+        if amt.balance_as_of(as_of) != expected:
+            raise SystemExit("Balances differ")
+
+    results = [
+        ("parse, Decimal division", lambda: [parse_decimal(s) for s in strings]),
+        ("parse, Amount", lambda: [gnucashxml._parse_number(s) for s in strings]),
+        ("total, Decimal loop", lambda: total_loop(decimal_values)),
+        ("total, Amount loop", lambda: total_loop(amount_values)),
+        ("total, Decimal sum()", lambda: sum(decimal_values)),
+        ("total, Amount.sum", lambda: gnucashxml.Amount.sum(amount_values)),
+        ("balances, Decimal loop", balances_decimal_loop),
+        ("balances, Amount loop", balances_amount_loop),
+        ("balances, Amount.sum", balances_amount_sum),
+        ("balances, index incl. build", balances_index_first),
+        ("balances, index built", balances_index),
+    ]
+    print("{} values in {} accounts".format(count, len(amount_accounts)))
+    for name, func in results:
+        seconds = min(timeit.repeat(func, number=1, repeat=3))
+        print("{:30} {:9.4f}s  {:8.4f} us/split".format(name, seconds, seconds / count * 1e6))
+
+
+if __name__ == "__main__":
+    main()
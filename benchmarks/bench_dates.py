@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Compare gnucashxml's fixed-format timestamp parser with dateutil
+#
+# Builds the kind of date strings found in a GnuCash book (posted dates
+# that repeat per day, entered dates that are mostly unique, gdate slot
+# values) and times both parsers over them.
+#
+# Usage: bench_dates.py [number of transactions]
+
+import random
+import sys
+import timeit
+
+from repo_module import import_gnucashxml
+gnucashxml = import_gnucashxml()
+from dateutil.parser import parse as dateutil_parse
+
+
+def make_dates(count):
+    rnd = random.Random(42)
+    dates = []
+    for i in range(count):
+        y, m, d = 2015 + rnd.randrange(10), 1 + rnd.randrange(12), 1 + rnd.randrange(28)
+        dates.append("{:04d}-{:02d}-{:02d} 10:59:00 +0000".format(y, m, d))
+        dates.append("{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d} -0500".format(
+            y, m, d, rnd.randrange(24), rnd.randrange(60), rnd.randrange(60)))
+        if i % 4 == 0:
+            dates.append("{:04d}-{:02d}-{:02d}".format(y, m, d))
+    return dates
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    dates = make_dates(count)
+
+    for text in dates[:1000]:
+        if gnucashxml._parse_date(text) != dateutil_parse(text):
+            raise SystemExit("Mismatch for {!r}".format(text))
+
+    def run_fast():
+        gnucashxml._parse_date.cache_clear()
+        for text in dates:
+            gnucashxml._parse_date(text)
+
+    def run_dateutil():
+        for text in dates:
+            dateutil_parse(text)
+
+    fast = min(timeit.repeat(run_fast, number=1, repeat=3))
+    slow = min(timeit.repeat(run_dateutil, number=1, repeat=3))
+    print("{} date strings".format(len(dates)))
+    print("dateutil:    {:8.3f}s  {:6.2f} us/date".format(slow, slow / len(dates) * 1e6))
+    print("_parse_date: {:8.3f}s  {:6.2f} us/date".format(fast, fast / len(dates) * 1e6))
+    print("speedup:     {:8.1f}x".format(slow / fast))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Write a synthetic GnuCash book for benchmarking
+#
+# The book is a gzipped gnc-v2 XML file like the ones GnuCash saves: a
+# currency and a number of securities with prices, an account tree of
+# the usual top-level types with a configurable depth and width,
+# STOCK/MUTUAL accounts for the securities, and transactions with a
+# configurable number of splits.  Slots (notes, online ids, dates) are
+# added to a configurable share of transactions and splits.  The same
+# arguments and seed always give the same book.
+#
+# Usage: generate_book.py [options] output-file
+#        generate_book.py --help
+
+import argparse
+import gzip
+import random
+from datetime import date, timedelta
+from xml.sax.saxutils import escape
+
+NAMESPACES = ("gnc", "act", "book", "cd", "cmdty", "price", "slot", "split",
+              "sx", "trn", "ts", "fs", "bgt", "recurrence", "lot")
+
+TOP_LEVEL = [("Assets", "ASSET", ["BANK", "ASSET", "CASH"]),
+             ("Liabilities", "LIABILITY", ["CREDIT", "LIABILITY"]),
+             ("Income", "INCOME", ["INCOME"]),
+             ("Expenses", "EXPENSE", ["EXPENSE"]),
+             ("Equity", "EQUITY", ["EQUITY"])]
+
+DESCRIPTIONS = ["Grocery store", "Paycheck", "Electric bill", "Rent",
+                "Restaurant", "Gas station", "Transfer", "Dividend",
+                "Insurance", "Pharmacy", "Hardware & garden", "Online order"]
+
+
+class BookWriter(object):
+    """Generate the book and write it to a text file object."""
+
+    def __init__(self, out, args):
+        self.out = out
+        self.args = args
+        self.rnd = random.Random(args.seed)
+        self.counter = 0
+        self.split_count = 0
+
+    def guid(self):
+        self.counter += 1
+        return "{:032x}".format(self.rnd.getrandbits(96) << 32 | self.counter)
+
+    def write(self):
+        args = self.args
+        w = self.out.write
+        w('<?xml version="1.0" encoding="utf-8" ?>\n<gnc-v2\n')
+        w("\n".join('     xmlns:{0}="http://www.gnucash.org/XML/{0}"'.format(ns)
+                    for ns in NAMESPACES))
+        w('>\n<gnc:count-data cd:type="book">1</gnc:count-data>\n')
+        w('<gnc:book version="2.0.0">\n')
+        w('<book:id type="guid">{}</book:id>\n'.format(self.guid()))
+        w(self.slots([("options", "frame", [("Accounts", "frame", [
+            ("Use Trading Accounts", "string", "f")])])], 0, "book:slots"))
+
+        securities = [("NASDAQ" if i % 2 else "FUND", "SEC{:03d}".format(i))
+                      for i in range(args.commodities)]
+        accounts = self.account_tree(securities)
+        w('<gnc:count-data cd:type="commodity">{}</gnc:count-data>\n'
+          .format(len(securities) + 1))
+        w('<gnc:count-data cd:type="account">{}</gnc:count-data>\n'
+          .format(len(accounts)))
+        w('<gnc:count-data cd:type="transaction">{}</gnc:count-data>\n'
+          .format(args.transactions))
+        w('<gnc:count-data cd:type="schedxaction">1</gnc:count-data>\n')
+        self.commodities(securities)
+        self.pricedb(securities)
+        for account in accounts:
+            self.account(*account)
+        self.transactions(accounts)
+        self.templates()
+        w('</gnc:book>\n</gnc-v2>\n\n<!-- Local variables: -->\n'
+          '<!-- mode: xml        -->\n<!-- End:             -->\n')
+
+    def account_tree(self, securities):
+        """Return a list of (name, type, guid, parent guid, commodity, scu)."""
+        args = self.args
+        root = self.guid()
+        accounts = [("Root Account", "ROOT", root, None, None, None)]
+
+        def children(name, parent, actypes, depth):
+            for i in range(args.width):
+                child = ("{} {}".format(name, i + 1), self.rnd.choice(actypes),
+                         self.guid(), parent, ("CURRENCY", "USD"), 100)
+                accounts.append(child)
+                if depth < args.depth:
+                    children(child[0], child[2], actypes, depth + 1)
+
+        for name, actype, subtypes in TOP_LEVEL:
+            top = (name, actype, self.guid(), root, ("CURRENCY", "USD"), 100)
+            accounts.append(top)
+            if args.depth > 1:
+                children(name, top[2], subtypes, 2)
+            if name == "Assets" and args.investments:
+                brokerage = ("Brokerage", "ASSET", self.guid(), top[2],
+                             ("CURRENCY", "USD"), 100)
+                accounts.append(brokerage)
+                for i in range(args.investments):
+                    space, cid = securities[i % len(securities)]
+                    accounts.append((cid if i < len(securities) else
+                                     "{} {}".format(cid, i),
+                                     "MUTUAL" if space == "FUND" else "STOCK",
+                                     self.guid(), brokerage[2], (space, cid),
+                                     10000))
+        return accounts
+
+    def commodities(self, securities):
+        w = self.out.write
+        w('<gnc:commodity version="2.0.0">\n  <cmdty:space>CURRENCY</cmdty:space>\n'
+          '  <cmdty:id>USD</cmdty:id>\n  <cmdty:get_quotes/>\n'
+          '  <cmdty:quote_source>currency</cmdty:quote_source>\n'
+          '  <cmdty:quote_tz/>\n</gnc:commodity>\n')
+        for space, cid in securities:
+            w('<gnc:commodity version="2.0.0">\n  <cmdty:space>{}</cmdty:space>\n'
+              '  <cmdty:id>{}</cmdty:id>\n  <cmdty:name>{} Inc.</cmdty:name>\n'
+              '  <cmdty:fraction>10000</cmdty:fraction>\n</gnc:commodity>\n'
+              .format(space, cid, cid))
+
+    def pricedb(self, securities):
+        if not securities:
+            return
+        w = self.out.write
+        w('<gnc:pricedb version="1">\n')
+        day = date(self.args.start_year, 1, 1)
+        while day.year < self.args.start_year + self.args.years:
+            for space, cid in securities:
+                w('  <price>\n    <price:id type="guid">{}</price:id>\n'
+                  '    <price:commodity>\n      <cmdty:space>{}</cmdty:space>\n'
+                  '      <cmdty:id>{}</cmdty:id>\n    </price:commodity>\n'
+                  '    <price:currency>\n      <cmdty:space>CURRENCY</cmdty:space>\n'
+                  '      <cmdty:id>USD</cmdty:id>\n    </price:currency>\n'
+                  '    <price:time>\n      <ts:date>{} 10:59:00 +0000</ts:date>\n'
+                  '    </price:time>\n    <price:source>user:price</price:source>\n'
+                  '    <price:type>last</price:type>\n'
+                  '    <price:value>{}/100</price:value>\n  </price>\n'
+                  .format(self.guid(), space, cid, day,
+                          self.rnd.randrange(1000, 50000)))
+            day += timedelta(days=30)
+        w('</gnc:pricedb>\n')
+
+    def account(self, name, actype, guid, parent, commodity, scu):
+        w = self.out.write
+        w('<gnc:account version="2.0.0">\n  <act:name>{}</act:name>\n'
+          '  <act:id type="guid">{}</act:id>\n  <act:type>{}</act:type>\n'
+          .format(escape(name), guid, actype))
+        if commodity is not None:
+            w('  <act:commodity>\n    <cmdty:space>{}</cmdty:space>\n'
+              '    <cmdty:id>{}</cmdty:id>\n  </act:commodity>\n'
+              '  <act:commodity-scu>{}</act:commodity-scu>\n'
+              .format(commodity[0], commodity[1], scu))
+        if self.rnd.random() < self.args.slot_density:
+            w('  <act:description>{} account</act:description>\n'
+              .format(escape(name)))
+            w(self.slots([("color", "string", "Not Set"),
+                          ("placeholder", "string", "false")], 2, "act:slots"))
+        if parent is not None:
+            w('  <act:parent type="guid">{}</act:parent>\n'.format(parent))
+        w('</gnc:account>\n')
+
+    def transactions(self, accounts):
+        args = self.args
+        rnd = self.rnd
+        w = self.out.write
+        # Splits go to leaf accounts; one split of every transaction
+        # moves money in or out of an asset or liability account.
+        parents = set(account[3] for account in accounts)
+        leaves = [account for account in accounts
+                  if account[2] not in parents and account[1] != "ROOT"]
+        funding = [account for account in leaves
+                   if account[1] in ("BANK", "ASSET", "CASH", "CREDIT",
+                                     "LIABILITY")] or leaves
+        first = date(args.start_year, 1, 1).toordinal()
+        days = date(args.start_year + args.years, 1, 1).toordinal() - first
+        for i in range(args.transactions):
+            posted = date.fromordinal(first + rnd.randrange(days))
+            w('<gnc:transaction version="2.0.0">\n'
+              '  <trn:id type="guid">{}</trn:id>\n  <trn:currency>\n'
+              '    <cmdty:space>CURRENCY</cmdty:space>\n    <cmdty:id>USD</cmdty:id>\n'
+              '  </trn:currency>\n'.format(self.guid()))
+            if rnd.random() < 0.3:
+                w('  <trn:num>{}</trn:num>\n'.format(rnd.randrange(1000, 9999)))
+            w('  <trn:date-posted>\n    <ts:date>{} 10:59:00 +0000</ts:date>\n'
+              '  </trn:date-posted>\n  <trn:date-entered>\n'
+              '    <ts:date>{} {:02d}:{:02d}:{:02d} -0500</ts:date>\n'
+              '  </trn:date-entered>\n  <trn:description>{}</trn:description>\n'
+              .format(posted, posted, rnd.randrange(24), rnd.randrange(60),
+                      rnd.randrange(60), escape(rnd.choice(DESCRIPTIONS))))
+            if rnd.random() < args.slot_density:
+                slots = [("date-posted", "gdate", posted.isoformat())]
+                if rnd.random() < 0.3:
+                    slots.append(("notes", "string", "Note {}".format(i)))
+                w(self.slots(slots, 2, "trn:slots"))
+            w('  <trn:splits>\n')
+            values = [rnd.randrange(1, 100000)
+                      for n in range(args.splits - 1)]
+            self.split(rnd.choice(funding), -sum(values), posted)
+            for value in values:
+                self.split(rnd.choice(leaves), value, posted)
+            w('  </trn:splits>\n</gnc:transaction>\n')
+
+    def split(self, account, value, posted):
+        rnd = self.rnd
+        w = self.out.write
+        self.split_count += 1
+        if account[5] == 100:
+            quantity = "{}/100".format(value)
+        else:
+            quantity = "{}/{}".format(value * rnd.randrange(1, 50), account[5])
+        state = rnd.choice("nnncy")
+        w('    <trn:split>\n      <split:id type="guid">{}</split:id>\n'
+          .format(self.guid()))
+        if rnd.random() < 0.2:
+            w('      <split:memo>Memo {}</split:memo>\n'.format(self.split_count))
+        w('      <split:reconciled-state>{}</split:reconciled-state>\n'
+          .format(state))
+        if state == "y":
+            w('      <split:reconcile-date>\n'
+              '        <ts:date>{} 23:59:59 +0000</ts:date>\n'
+              '      </split:reconcile-date>\n'.format(posted))
+        w('      <split:value>{}/100</split:value>\n'
+          '      <split:quantity>{}</split:quantity>\n'
+          '      <split:account type="guid">{}</split:account>\n'
+          .format(value, quantity, account[2]))
+        if rnd.random() < self.args.slot_density / 4:
+            w(self.slots([("online_id", "string",
+                           "OFX{}".format(self.split_count))], 6, "split:slots"))
+        w('    </trn:split>\n')
+
+    def templates(self):
+        """A scheduled transaction with its template account and transaction."""
+        w = self.out.write
+        root, account = self.guid(), self.guid()
+        w('<gnc:template-transactions>\n')
+        self.account("Template Root", "ROOT", root, None, None, None)
+        self.account(account, "BANK", account, root, ("template", "template"), 1)
+        w('<gnc:transaction version="2.0.0">\n  <trn:id type="guid">{}</trn:id>\n'
+          '  <trn:currency>\n    <cmdty:space>CURRENCY</cmdty:space>\n'
+          '    <cmdty:id>USD</cmdty:id>\n  </trn:currency>\n'
+          '  <trn:date-posted>\n    <ts:date>{}-01-01 10:59:00 +0000</ts:date>\n'
+          '  </trn:date-posted>\n  <trn:date-entered>\n'
+          '    <ts:date>{}-01-01 10:59:00 +0000</ts:date>\n  </trn:date-entered>\n'
+          '  <trn:description>Rent</trn:description>\n  <trn:splits>\n'
+          '    <trn:split>\n      <split:id type="guid">{}</split:id>\n'
+          '      <split:reconciled-state>n</split:reconciled-state>\n'
+          '      <split:value>0/1</split:value>\n'
+          '      <split:quantity>0/1</split:quantity>\n'
+          '      <split:account type="guid">{}</split:account>\n'
+          '    </trn:split>\n  </trn:splits>\n</gnc:transaction>\n'
+          .format(self.guid(), self.args.start_year, self.args.start_year,
+                  self.guid(), account))
+        w('</gnc:template-transactions>\n')
+        w('<gnc:schedxaction version="2.0.0">\n  <sx:id type="guid">{}</sx:id>\n'
+          '  <sx:name>Rent</sx:name>\n  <sx:templ-acct type="guid">{}</sx:templ-acct>\n'
+          '</gnc:schedxaction>\n'.format(self.guid(), account))
+
+    def slots(self, slots, indent, tag):
+        """Return the XML for a list of (key, type, value) slots."""
+        pad = " " * indent
+        return "{0}<{1}>\n{2}{0}</{1}>\n".format(
+            pad, tag, "".join(self.slot(slot, indent + 2) for slot in slots))
+
+    def slot(self, slot, indent):
+        key, type_, value = slot
+        pad = " " * indent
+        if type_ == "frame":
+            value = "\n{}{}  ".format(
+                "".join(self.slot(child, indent + 4) for child in value), pad)
+        elif type_ == "gdate":
+            value = "\n{0}    <gdate>{1}</gdate>\n{0}  ".format(pad, value)
+        else:
+            value = escape(value)
+        return ('{0}<slot>\n{0}  <slot:key>{1}</slot:key>\n'
+                '{0}  <slot:value type="{2}">{3}</slot:value>\n{0}</slot>\n'
+                .format(pad, key, type_, value))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Write a synthetic gzipped GnuCash XML book.")
+    parser.add_argument("output", help="file to write (gzipped unless --plain)")
+    parser.add_argument("--transactions", type=int, default=10000,
+                        help="number of transactions (default 10000)")
+    parser.add_argument("--splits", type=int, default=2,
+                        help="splits per transaction, at least 2 (default 2)")
+    parser.add_argument("--depth", type=int, default=3,
+                        help="depth of the account tree below the top-level "
+                             "accounts (default 3)")
+    parser.add_argument("--width", type=int, default=4,
+                        help="subaccounts per account (default 4)")
+    parser.add_argument("--commodities", type=int, default=5,
+                        help="number of securities besides USD (default 5)")
+    parser.add_argument("--investments", type=int, default=None,
+                        help="number of STOCK/MUTUAL accounts "
+                             "(default: one per security)")
+    parser.add_argument("--slot-density", type=float, default=0.5,
+                        help="share of transactions and accounts with "
+                             "slots, 0 to 1 (default 0.5)")
+    parser.add_argument("--start-year", type=int, default=2015)
+    parser.add_argument("--years", type=int, default=10,
+                        help="years of transactions (default 10)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--plain", action="store_true",
+                        help="write uncompressed XML")
+    args = parser.parse_args(argv)
+    if args.splits < 2:
+        parser.error("--splits must be at least 2")
+    if args.investments is None:
+        args.investments = args.commodities
+    if args.investments and not args.commodities:
+        parser.error("--investments needs at least one commodity")
+    return args
+
+
+def generate(args):
+    """Write the book described by args; return the number of splits."""
+    if args.plain:
+        out = open(args.output, "w", encoding="utf-8")
+    else:
+        out = gzip.open(args.output, "wt", encoding="utf-8", compresslevel=6)
+    with out:
+        writer = BookWriter(out, args)
+        writer.write()
+    return writer.split_count
+
+
+def main():
+    args = parse_args()
+    count = generate(args)
+    print("Wrote {} transactions with {} splits to {}".format(
+        args.transactions, count, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Import the gnucashxml module of this source tree for the benchmarks
+#
+# The library is a file without a .py extension, which the normal import
+# system does not find; putting the tree on sys.path would import an
+# installed copy instead, if there is one.  The file is loaded by its
+# path and registered as the gnucashxml module, so pickled objects and
+# worker processes refer to the same module.
+
+import importlib.machinery
+import importlib.util
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE_PATH = os.path.join(REPO_DIR, "gnucashxml")
+
+
+def import_gnucashxml(path=MODULE_PATH):
+    """
+    Return the gnucashxml module loaded from this tree, or from the
+    library file path, e.g. one exported from an older revision.
+    """
+    module = sys.modules.get("gnucashxml")
+    if module is not None and getattr(module, "__file__", None) == path:
+        return module
+    loader = importlib.machinery.SourceFileLoader("gnucashxml", path)
+    spec = importlib.util.spec_from_loader("gnucashxml", loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["gnucashxml"] = module
+    loader.exec_module(module)
+    return module
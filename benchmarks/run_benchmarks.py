@@ -0,0 +1,256 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Run the gnucashxml benchmark suite and write the results as JSON
+#
+# For each size (number of splits) a synthetic book is generated with
+# generate_book.py, or reused from the books directory if it is there
+# already, and measured in a fresh Python process so that the peak RSS
+# belongs to that size alone.
+#
+# The core measurements use only the API of the original gnucashxml
+# (from_filename, walk, find_account, splits), so they run against every
+# revision of the library; with --module a library file exported from an
+# older revision (git show REV:gnucashxml > FILE) is measured instead of
+# the one in this tree.  Measured per book:
+#   parse        from_filename() of the gzipped book
+#   walk         a full Book.walk() over the account tree
+#   find         Book.find_account() for every account name
+#   report       the report scripts' loop: balance and quantity of every
+#                account as of today by adding up its splits
+#   slots        first use of .slots of every account, transaction and
+#                split (run once, after the others)
+#   book_mb      growth of the resident set size over the parse, in MB
+#                (Linux only, otherwise null)
+#   peak_rss     maximum resident set size of the process, in MB
+# Measured only when the library has the API, otherwise null:
+#   report_index balance_as_of() and quantity_as_of() of every account;
+#                report_index_cold is its first run, which builds the
+#                indexes
+#   query        Book.query() of the splits of every top-level account's
+#                subtree in the past year
+# Times are the best of --repeat runs, except parse (best of
+# --parse-repeat), slots and the cold runs, which run once.
+#
+# Usage: run_benchmarks.py [--sizes 10000,100000,1000000] [--output results.json]
+#                          [--module path/to/gnucashxml] [--slot-density 0.5]
+#                          [--parse-repeat 1]
+
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import date
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+import generate_book
+from repo_module import REPO_DIR, MODULE_PATH, import_gnucashxml
+
+
+def best_of(repeat, func):
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def once(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def resident_bytes():
+    # Current resident set size, or None where /proc is not available
+    try:
+        with open("/proc/self/statm") as fobj:
+            return int(fobj.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return None
+
+
+def measure(filename, repeat, parse_repeat, module_path):
+    """Measure one book in this process and return the results."""
+    gnucashxml = import_gnucashxml(module_path)
+
+    parse = None
+    for i in range(parse_repeat):
+        book = None
+        gc.collect()
+        before = resident_bytes()
+        start = time.perf_counter()
+        book = gnucashxml.from_filename(filename)
+        elapsed = time.perf_counter() - start
+        parse = elapsed if parse is None else min(parse, elapsed)
+    gc.collect()
+    after = resident_bytes()
+
+    accounts = [account for account, children, splits in book.walk()]
+    names = [account.name for account in accounts]
+    today = date.today()
+
+    def walk():
+        for account, children, splits in book.walk():
+            pass
+
+    def find():
+        for name in names:
+            book.find_account(name)
+
+    def report():
+        for account in accounts:
+            balance = 0
+            quantity = 0
+            for split in account.splits:
+                if split.transaction.date.date() <= today:
+                    balance += split.value
+                    quantity += split.quantity
+
+    results = {
+        "transactions": len(book.transactions),
+        "accounts": len(accounts),
+        "splits": sum(len(account.splits) for account in accounts),
+        "file_bytes": os.path.getsize(filename),
+        "parse_s": parse,
+        "walk_s": best_of(repeat, walk),
+        "find_s": best_of(repeat, find),
+        "report_s": best_of(repeat, report),
+        "slots_s": None,
+        "book_mb": (after - before) / (1024 * 1024) if before is not None else None,
+        "report_index_cold_s": None,
+        "report_index_s": None,
+        "query_s": None,
+    }
+
+    # Newer API, measured when the library has it
+    if hasattr(gnucashxml.Account, "balance_as_of"):
+        def report_index():
+            for account in accounts:
+                account.balance_as_of(today)
+                account.quantity_as_of(today)
+
+        results["report_index_cold_s"] = once(report_index)
+        results["report_index_s"] = best_of(repeat, report_index)
+
+    if hasattr(gnucashxml.Book, "query"):
+        year_ago = today.replace(year=today.year - 1)
+        top_level = [account.name for account in book.root_account.children]
+
+        def query():
+            for name in top_level:
+                for split in book.query().subtree(name).between(year_ago, today):
+                    pass
+
+        results["query_s"] = best_of(repeat, query)
+
+    def slots():
+        for account in accounts:
+            account.slots
+        for transaction in book.transactions:
+            transaction.slots
+            for split in transaction.splits:
+                split.slots
+
+    results["slots_s"] = once(slots)
+
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    results["peak_rss_mb"] = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss /
+                              (1024 * 1024 if sys.platform == "darwin" else 1024))
+    return results
+
+
+def book_for_size(splits, books_dir, splits_per_transaction, slot_density):
+    """Return the path of the generated book with about splits splits."""
+    filename = os.path.join(books_dir, "book-{}-{}-{}.gnucash".format(
+        splits, splits_per_transaction, slot_density))
+    if not os.path.exists(filename):
+        os.makedirs(books_dir, exist_ok=True)
+        args = generate_book.parse_args(
+            ["--transactions", str(splits // splits_per_transaction),
+             "--splits", str(splits_per_transaction),
+             "--slot-density", str(slot_density), filename + ".tmp"])
+        generate_book.generate(args)
+        os.replace(filename + ".tmp", filename)
+    return filename
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_DIR,
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark gnucashxml on synthetic books.")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="comma separated numbers of splits")
+    parser.add_argument("--splits-per-transaction", type=int, default=2)
+    parser.add_argument("--slot-density", type=float, default=0.5,
+                        help="share of transactions and accounts with slots")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--parse-repeat", type=int, default=1)
+    parser.add_argument("--books", default=os.path.join(BENCH_DIR, "books"),
+                        help="directory for the generated books")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--module", default=MODULE_PATH,
+                        help="gnucashxml file to measure (default: the one in this tree)")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    module_path = os.path.abspath(args.module)
+
+    if args.measure:
+        # Child process: measure one book, print its results
+        json.dump(measure(args.measure, args.repeat, args.parse_repeat, module_path),
+                  sys.stdout)
+        return
+
+    results = []
+    for size in [int(size) for size in args.sizes.split(",")]:
+        filename = book_for_size(size, args.books, args.splits_per_transaction,
+                                 args.slot_density)
+        output = subprocess.check_output(
+            [sys.executable, os.path.abspath(__file__), "--measure", filename,
+             "--repeat", str(args.repeat), "--parse-repeat", str(args.parse_repeat),
+             "--module", module_path])
+        result = json.loads(output)
+        result["size"] = size
+        result["slot_density"] = args.slot_density
+        results.append(result)
+        print("{size:>9} splits: parse {parse_s:7.2f}s  walk {walk_s:8.5f}s  "
+              "find {find_s:8.5f}s  report {report_s:7.3f}s  slots {slots_s:6.3f}s  "
+              "peak RSS {peak_rss_mb:7.1f} MB".format(**result),
+              file=sys.stderr)
+
+    gnucashxml = import_gnucashxml(module_path)
+    document = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "module": module_path,
+        "revision": git_revision() if module_path == MODULE_PATH else None,
+        "gnucashxml_version": gnucashxml.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as fobj:
+            json.dump(document, fobj, indent=2)
+            fobj.write("\n")
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Helpers of the gnucashxml tests
+#
+# reference() reads a GnuCash XML file the way the original gnucashxml
+# did: the whole document with ElementTree, dates with dateutil and
+# amounts as Decimal numerator / denominator.  dump() turns a Book into
+# the same plain form, so the books loaded by the faster paths (iterparse,
+# cache, process pool, selective parse, SQLite) can be compared with it.
+# to_sqlite() writes a Book to a GnuCash SQLite file.
+
+import datetime
+import decimal
+import sqlite3
+import uuid
+
+from dateutil.parser import parse as parse_date
+from xml.etree import ElementTree
+
+NS = {
+    'gnc': "http://www.gnucash.org/XML/gnc",
+    'act': "http://www.gnucash.org/XML/act",
+    'book': "http://www.gnucash.org/XML/book",
+    'cmdty': "http://www.gnucash.org/XML/cmdty",
+    'slot': "http://www.gnucash.org/XML/slot",
+    'split': "http://www.gnucash.org/XML/split",
+    'trn': "http://www.gnucash.org/XML/trn",
+    'ts': "http://www.gnucash.org/XML/ts",
+}
+
+
+##################################################################
+# Reference reader
+
+def reference(filename):
+    """
+    Return the plain form of the book in the XML file filename, see
+    dump().
+    """
+    book = ElementTree.parse(filename).getroot().find('gnc:book', NS)
+    commodities = tuple((elt.find('cmdty:space', NS).text,
+                         elt.find('cmdty:id', NS).text)
+                        for elt in book.findall('gnc:commodity', NS))
+
+    accounts = {}
+    for elt in book.findall('gnc:account', NS):
+        actype = elt.find('act:type', NS).text
+        if actype == 'ROOT':
+            commodity = parent = scu = None
+        else:
+            commodity = (elt.find('act:commodity/cmdty:space', NS).text,
+                         elt.find('act:commodity/cmdty:id', NS).text)
+            parent = elt.find('act:parent', NS).text
+            scu = int(elt.find('act:commodity-scu', NS).text)
+        accounts[elt.find('act:id', NS).text] = [
+            elt.find('act:name', NS).text, actype,
+            _text(elt, 'act:description'), commodity, scu, parent,
+            _slots(elt.find('act:slots', NS)), []]
+
+    transactions = []
+    for elt in book.findall('gnc:transaction', NS):
+        splits = []
+        for split in elt.findall('trn:splits/trn:split', NS):
+            guid = split.find('split:id', NS).text
+            account = split.find('split:account', NS).text
+            reconcile_date = _text(split, 'split:reconcile-date/ts:date')
+            splits.append((
+                guid, _text(split, 'split:memo'),
+                split.find('split:reconciled-state', NS).text,
+                reconcile_date and parse_date(reconcile_date),
+                _number(split.find('split:value', NS).text),
+                _number(split.find('split:quantity', NS).text),
+                account, _slots(split.find('split:slots', NS))))
+            accounts[account][-1].append(guid)
+        transactions.append((
+            elt.find('trn:id', NS).text,
+            (elt.find('trn:currency/cmdty:space', NS).text,
+             elt.find('trn:currency/cmdty:id', NS).text),
+            parse_date(elt.find('trn:date-posted/ts:date', NS).text),
+            parse_date(elt.find('trn:date-entered/ts:date', NS).text),
+            _text(elt, 'trn:num'), elt.find('trn:description', NS).text,
+            _slots(elt.find('trn:slots', NS)), tuple(splits)))
+
+    return {
+        'guid': book.find('book:id', NS).text,
+        'slots': _slots(book.find('book:slots', NS)),
+        'commodities': commodities,
+        'accounts': {guid: tuple(fields[:-1]) + (tuple(fields[-1]),)
+                     for guid, fields in accounts.items()},
+        'transactions': transactions,
+    }
+
+
+def _text(elt, path):
+    found = elt.find(path, NS)
+    return None if found is None else found.text
+
+
+def _number(text):
+    num, denom = text.split("/")
+    return decimal.Decimal(num) / decimal.Decimal(denom)
+
+
+def _slots(elt):
+    if elt is None:
+        return ()
+    slots = []
+    for slot in elt.findall('slot'):
+        value = slot.find('slot:value', NS)
+        type_ = value.get('type', 'string')
+        if type_ in ('integer', 'double'):
+            item = int(value.text)
+        elif type_ == 'numeric':
+            item = _number(value.text)
+        elif type_ in ('string', 'guid'):
+            item = value.text
+        elif type_ == 'gdate':
+            item = parse_date(value.find('gdate').text)
+        elif type_ == 'timespec':
+            item = parse_date(value.find('ts:date', NS).text)
+        elif type_ == 'frame':
+            item = _slots(value)
+        else:
+            raise RuntimeError("Unknown slot type {}".format(type_))
+        slots.append((slot.find('slot:key', NS).text, item))
+    return tuple(sorted(slots))
+
+
+##################################################################
+# Plain form of a Book
+
+def dump(book):
+    """
+    Return a Book as a dict of plain values: the book's guid and slots,
+    its commodities as (space, name) pairs, its accounts by guid and its
+    transactions in order.  Slots become sorted (key, value) tuples and
+    amounts Decimals.
+    """
+    accounts = {}
+    pending = [book.root_account]
+    while pending:
+        acc = pending.pop()
+        pending.extend(acc.children)
+        accounts[acc.guid] = (
+            acc.name, acc.actype, acc.description,
+            acc.commodity and (acc.commodity.space, acc.commodity.name),
+            None if acc.commodity_scu is None else int(acc.commodity_scu),
+            acc.parent and acc.parent.guid, dump_slots(acc.slots),
+            tuple(split.guid for split in acc.splits))
+    transactions = []
+    for trn in book.transactions:
+        splits = tuple(
+            (split.guid, split.memo, split.reconciled_state,
+             split.reconcile_date, _decimal(split.value),
+             _decimal(split.quantity), split.account.guid,
+             dump_slots(split.slots))
+            for split in trn.splits)
+        transactions.append((
+            trn.guid, (trn.currency.space, trn.currency.name), trn.date,
+            trn.date_entered, trn.num, trn.description,
+            dump_slots(trn.slots), splits))
+    return {
+        'guid': book.guid,
+        'slots': dump_slots(book.slots),
+        'commodities': tuple((comm.space, comm.name)
+                             for comm in book.commodities),
+        'accounts': accounts,
+        'transactions': transactions,
+    }
+
+
+
+def dump_prices(book):
+    """Return the prices of a Book as a list of plain tuples."""
+    return [(price.guid, (price.commodity.space, price.commodity.name),
+             (price.currency.space, price.currency.name), price.date,
+             price.source, price.type, _decimal(price.value))
+            for price in book.prices]
+
+def dump_slots(slots):
+    """Return slots as a sorted tuple of (key, value) pairs."""
+    return tuple(sorted((key, dump_slots(value) if isinstance(value, dict)
+                         else _decimal(value))
+                        for key, value in slots.items()))
+
+
+def _decimal(value):
+    if hasattr(value, 'to_decimal'):
+        return value.to_decimal()
+    return value
+
+
+def select(plain, keep):
+    """
+    Return the plain form of a book with only the transactions for
+    which keep(transaction) is true, as a selective parse loads it.
+    """
+    transactions = [trn for trn in plain['transactions'] if keep(trn)]
+    kept = {split[0] for trn in transactions for split in trn[-1]}
+    accounts = {guid: fields[:-1] + (tuple(split for split in fields[-1]
+                                           if split in kept),)
+                for guid, fields in plain['accounts'].items()}
+    return dict(plain, accounts=accounts, transactions=transactions)
+
+
+def unordered(plain):
+    """
+    Return the plain form of a book with its transactions and the splits
+    of its accounts sorted by guid, for readers that store them in
+    another order.
+    """
+    accounts = {guid: fields[:-1] + (tuple(sorted(fields[-1])),)
+                for guid, fields in plain['accounts'].items()}
+    return dict(plain, accounts=accounts,
+                transactions=sorted(plain['transactions']))
+
+
+##################################################################
+# SQLite writer
+
+_SCHEMA = """
+CREATE TABLE books(guid text primary key, root_account_guid text,
+                   root_template_guid text);
+CREATE TABLE commodities(guid text primary key, namespace text,
+                         mnemonic text, fullname text, cusip text,
+                         fraction int, quote_flag int, quote_source text,
+                         quote_tz text);
+CREATE TABLE accounts(guid text primary key, name text, account_type text,
+                      commodity_guid text, commodity_scu int,
+                      non_std_scu int, parent_guid text, code text,
+                      description text, hidden int, placeholder int);
+CREATE TABLE transactions(guid text primary key, currency_guid text,
+                          num text, post_date text, enter_date text,
+                          description text);
+CREATE TABLE splits(guid text primary key, tx_guid text, account_guid text,
+                    memo text, action text, reconcile_state text,
+                    reconcile_date text, value_num bigint,
+                    value_denom bigint, quantity_num bigint,
+                    quantity_denom bigint, lot_guid text);
+CREATE TABLE prices(guid text primary key, commodity_guid text,
+                    currency_guid text, date text, source text, type text,
+                    value_num bigint, value_denom bigint);
+CREATE TABLE slots(id integer primary key autoincrement, obj_guid text,
+                   name text, slot_type int, int64_val bigint,
+                   string_val text, double_val float8, timespec_val text,
+                   guid_val text, numeric_val_num bigint,
+                   numeric_val_denom bigint, gdate_val text);
+"""
+
+
+def to_sqlite(book, filename):
+    """
+    Write book to filename as a GnuCash SQLite file, with a template
+    account and transaction that a reader has to skip.  Transactions
+    are stored in reverse order.
+    """
+    db = sqlite3.connect(filename)
+    try:
+        _SQLiteWriter(db).write(book)
+        db.commit()
+    finally:
+        db.close()
+
+
+class _SQLiteWriter(object):
+    def __init__(self, db):
+        self.db = db
+        self.commodities = {}
+
+    def insert(self, table, **row):
+        self.db.execute("INSERT INTO {}({}) VALUES({})".format(
+            table, ",".join(row), ",".join("?" * len(row))),
+            list(row.values()))
+
+    def write(self, book):
+        self.db.executescript(_SCHEMA)
+        for comm in list(book.commodities) + [None]:
+            key = ('template', 'template') if comm is None \
+                else (comm.space, comm.name)
+            guid = self.commodities[key] = uuid.uuid4().hex
+            self.insert('commodities', guid=guid, namespace=key[0],
+                        mnemonic=key[1])
+
+        template_root = uuid.uuid4().hex
+        template_account = uuid.uuid4().hex
+        self.insert('books', guid=book.guid,
+                    root_account_guid=book.root_account.guid,
+                    root_template_guid=template_root)
+        self.slots(book.guid, book.slots)
+        pending = [book.root_account]
+        while pending:
+            acc = pending.pop()
+            pending.extend(acc.children)
+            slots = dict(acc.slots)
+            flags = {}
+            for flag in ('placeholder', 'hidden'):
+                flags[flag] = int(slots.get(flag) == 'true')
+                if flags[flag]:
+                    del slots[flag]
+            self.insert('accounts', guid=acc.guid, name=acc.name,
+                        account_type=acc.actype,
+                        commodity_guid=acc.commodity and self.commodities[
+                            (acc.commodity.space, acc.commodity.name)],
+                        commodity_scu=int(acc.commodity_scu or 0),
+                        non_std_scu=0, parent_guid=acc.parent and
+                        acc.parent.guid, code="",
+                        description=acc.description or "", **flags)
+            self.slots(acc.guid, slots)
+        self.insert('accounts', guid=template_root, name="Template Root",
+                    account_type='ROOT', commodity_scu=0, non_std_scu=0,
+                    hidden=0, placeholder=0)
+        self.insert('accounts', guid=template_account, name="Template",
+                    account_type='BANK', commodity_guid=self.commodities[
+                        ('template', 'template')], commodity_scu=1,
+                    non_std_scu=0, parent_guid=template_root, hidden=0,
+                    placeholder=0)
+
+        for trn in reversed(book.transactions):
+            self.transaction(trn.guid, trn.currency, trn.num, trn.date,
+                             trn.date_entered, trn.description)
+            self.slots(trn.guid, trn.slots)
+            for split in trn.splits:
+                self.split(split.guid, trn.guid, split.account.guid,
+                           split.memo, split.reconciled_state,
+                           split.reconcile_date, split.value,
+                           split.quantity)
+                self.slots(split.guid, split.slots)
+        template = uuid.uuid4().hex
+        date = datetime.datetime(2020, 1, 1, 10, 59,
+                                 tzinfo=datetime.timezone.utc)
+        self.transaction(template, book.transactions[0].currency, None,
+                         date, date, "Template")
+        self.split(uuid.uuid4().hex, template, template_account, None,
+                   'n', None, 0, 0)
+
+        for price in book.prices:
+            self.insert('prices', guid=price.guid,
+                        commodity_guid=self.commodities[
+                            (price.commodity.space, price.commodity.name)],
+                        currency_guid=self.commodities[
+                            (price.currency.space, price.currency.name)],
+                        date=_sql_time(price.date), source=price.source,
+                        type=price.type, value_num=price.value.numerator,
+                        value_denom=price.value.denominator)
+
+    def transaction(self, guid, currency, num, date, date_entered,
+                    description):
+        self.insert('transactions', guid=guid,
+                    currency_guid=self.commodities[(currency.space,
+                                                    currency.name)],
+                    num=num or "", post_date=_sql_time(date),
+                    enter_date=_sql_time(date_entered),
+                    description=description)
+
+    def split(self, guid, transaction, account, memo, state,
+              reconcile_date, value, quantity):
+        self.insert('splits', guid=guid, tx_guid=transaction,
+                    account_guid=account, memo=memo or "", action="",
+                    reconcile_state=state,
+                    reconcile_date=_sql_time(reconcile_date),
+                    value_num=value.numerator,
+                    value_denom=value.denominator,
+                    quantity_num=quantity.numerator,
+                    quantity_denom=quantity.denominator)
+
+    def slots(self, guid, slots, prefix=""):
+        for key, value in slots.items():
+            row = dict(obj_guid=guid, name=prefix + key)
+            if isinstance(value, dict):
+                frame = uuid.uuid4().hex
+                row.update(slot_type=9, guid_val=frame)
+                self.slots(frame, value, prefix + key + "/")
+            elif isinstance(value, int):
+                row.update(slot_type=1, int64_val=value)
+            elif hasattr(value, 'numerator'):
+                row.update(slot_type=3, numeric_val_num=value.numerator,
+                           numeric_val_denom=value.denominator)
+            elif isinstance(value, datetime.datetime):
+                if value.tzinfo is None:
+                    row.update(slot_type=10,
+                               gdate_val=value.strftime("%Y%m%d"))
+                else:
+                    row.update(slot_type=6, timespec_val=_sql_time(value))
+            elif _is_guid(value):
+                row.update(slot_type=5, guid_val=value)
+            else:
+                row.update(slot_type=4, string_val=value)
+            self.insert('slots', **row)
+
+
+def _sql_time(date):
+    if date is None:
+        return "1970-01-01 00:00:00"
+    return date.astimezone(datetime.timezone.utc).strftime(
+        "%Y-%m-%d %H:%M:%S")
+
+
+def _is_guid(text):
+    return len(text) == 32 and all(c in "0123456789abcdef" for c in text)
+
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Fixtures of the gnucashxml tests
+#
+# The tests run on data/book.xml, a small book with investment accounts,
+# prices, a template transaction, every slot type and an empty slot
+# frame.  The library is loaded from this tree the way the benchmarks
+# load it.
+
+import gzip
+import os
+import shutil
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), "benchmarks"))
+
+from repo_module import import_gnucashxml  # noqa: E402
+
+import bookdump  # noqa: E402
+
+BOOK_XML = os.path.join(TESTS_DIR, "data", "book.xml")
+
+
+@pytest.fixture(scope="session")
+def gnucashxml():
+    return import_gnucashxml()
+
+
+@pytest.fixture(scope="session")
+def reference():
+    """The fixture book as read by the reference reader."""
+    return bookdump.reference(BOOK_XML)
+
+
+@pytest.fixture
+def book_path(tmp_path):
+    """A copy of the fixture book that a test may modify."""
+    path = str(tmp_path / "book.xml")
+    shutil.copyfile(BOOK_XML, path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def gzip_path(tmp_path_factory):
+    """The fixture book gzipped, as GnuCash saves it."""
+    path = str(tmp_path_factory.mktemp("gzip") / "book.gnucash")
+    with open(BOOK_XML, "rb") as source, gzip.open(path, "wb") as target:
+        shutil.copyfileobj(source, target)
+    return path
+
+
+@pytest.fixture(scope="session")
+def sqlite_path(gnucashxml, tmp_path_factory):
+    """The fixture book as a GnuCash SQLite file."""
+    path = str(tmp_path_factory.mktemp("sqlite") / "book.gnucash")
+    bookdump.to_sqlite(gnucashxml.from_filename(BOOK_XML), path)
+    return path
@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# The arithmetic contract of Amount
+
+import copy
+import decimal
+import fractions
+import pickle
+
+import pytest
+
+from conftest import BOOK_XML
+
+D = decimal.Decimal
+
+
+@pytest.fixture(scope="module")
+def Amount(gnucashxml):
+    return gnucashxml.Amount
+
+
+def test_integers_only(Amount):
+    amount = Amount(-1234, 100)
+    assert amount.numerator == -1234 and amount.denominator == 100
+    assert type(amount.numerator) is int and type(amount.denominator) is int
+    assert not hasattr(amount, '__dict__')
+    assert Amount(5, -10).numerator == -5
+    assert Amount(5, -10).denominator == 10
+    with pytest.raises(ZeroDivisionError):
+        Amount(1, 0)
+
+
+def test_to_decimal_cached(Amount):
+    amount = Amount(1, 3)
+    value = amount.to_decimal()
+    assert value == D(1) / D(3)
+    assert amount.to_decimal() is value
+    assert Amount(1234, 100).to_decimal() == D("12.34")
+    assert Amount(7).to_decimal() == D(7)
+
+
+def test_parsed_amounts(gnucashxml):
+    split = gnucashxml.from_filename(BOOK_XML).transactions[0].splits[0]
+    assert isinstance(split.value, gnucashxml.Amount)
+    assert isinstance(split.quantity, gnucashxml.Amount)
+    assert split.value.denominator == 100
+
+
+def test_add_sub_exact(Amount):
+    total = Amount(1, 100) + Amount(2, 100)
+    assert isinstance(total, Amount)
+    assert (total.numerator, total.denominator) == (3, 100)
+    mixed = Amount(1, 100) + Amount(1, 10000)
+    assert (mixed.numerator, mixed.denominator) == (101, 10000)
+    assert Amount(1, 3) - Amount(1, 6) == Amount(1, 6)
+    assert Amount(150, 100) + 1 == Amount(250, 100)
+    assert 1 - Amount(150, 100) == Amount(-50, 100)
+    assert isinstance(1 + Amount(1, 100), Amount)
+    # Many small amounts add up exactly, unlike floats
+    assert sum([Amount(1, 10)] * 10, Amount(0, 10)) == 1
+    assert Amount.sum([Amount(1, 10)] * 10) == 1
+    assert Amount.sum([Amount(1, 3), Amount(1, 6), Amount(1, 2)]) == 1
+    assert Amount.sum([]) == 0
+    assert Amount.sum(iter([Amount(1, 100), Amount(2, 100)])) == \
+        Amount(3, 100)
+
+
+def test_mul(Amount):
+    assert Amount(150, 100) * 2 == 3
+    assert Amount(150, 100) * Amount(1, 2) == Amount(75, 100)
+    assert isinstance(3 * Amount(1, 3), Amount)
+    assert 3 * Amount(1, 3) == 1
+
+
+def test_neg_abs(Amount):
+    assert -Amount(5, 100) == Amount(-5, 100)
+    assert abs(Amount(-5, 100)) == Amount(5, 100)
+    assert +Amount(5, 100) == Amount(5, 100)
+    assert not Amount(0, 100)
+    assert Amount(1, 100)
+
+
+def test_division_gives_decimal(Amount):
+    assert Amount(1, 1) / 3 == D(1) / D(3)
+    assert isinstance(Amount(1, 1) / 3, D)
+    assert Amount(3, 100) / Amount(1, 100) == D(3)
+    assert 1 / Amount(4, 1) == D("0.25")
+
+
+def test_mixed_types(Amount):
+    value = Amount(1234, 100) + D("0.01")
+    assert isinstance(value, D) and value == D("12.35")
+    assert D("0.01") + Amount(1234, 100) == D("12.35")
+    assert Amount(1234, 100) - D("0.34") == D("12.00")
+    assert D("20") - Amount(1234, 100) == D("7.66")
+    assert Amount(1234, 100) * D("2") == D("24.68")
+    value = Amount(1, 4) + 0.5
+    assert isinstance(value, float) and value == 0.75
+    assert float(Amount(1, 4)) == 0.25
+    assert int(Amount(-150, 100)) == -1
+    assert int(Amount(150, 100)) == 1
+    with pytest.raises(TypeError):
+        Amount(1, 100) + "1"
+
+
+def test_comparisons_exact(Amount):
+    assert Amount(1, 3) == fractions.Fraction(1, 3)
+    assert Amount(1, 3) != D(1) / D(3)
+    assert Amount(1234, 100) == D("12.34")
+    assert Amount(50, 100) == 0.5
+    assert Amount(1, 10) != 0.1
+    assert Amount(150, 100) == Amount(15, 10)
+    assert Amount(1, 100) < Amount(2, 100) <= Amount(2, 100)
+    assert Amount(1, 3) > Amount(33, 100)
+    assert Amount(-1, 100) < 0 < Amount(1, 100)
+    assert Amount(1, 100) < D("0.02")
+    assert Amount(1, 100) < float("inf")
+    assert Amount(1, 100) > float("-inf")
+    assert Amount(1, 100) != float("nan")
+    assert Amount(1, 100) != "0.01"
+    assert sorted([Amount(3, 1), D(1), 2]) == [1, 2, 3]
+
+
+def test_hash_matches_equal_values(Amount):
+    assert hash(Amount(300, 100)) == hash(3)
+    assert hash(Amount(150, 100)) == hash(D("1.5"))
+    assert hash(Amount(150, 100)) == hash(Amount(3, 2))
+    assert hash(Amount(1, 3)) == hash(fractions.Fraction(1, 3))
+    assert len({Amount(100, 100), Amount(1, 1), 1, D("1.00")}) == 1
+
+
+def test_str_format_round(Amount):
+    assert str(Amount(1234, 100)) == "12.34"
+    assert str(Amount(-5, 1)) == "-5"
+    assert "{:,.2f}".format(Amount(123456789, 100)) == "1,234,567.89"
+    assert "{:.1f}".format(Amount(125, 100)) == "1.2"
+    assert round(Amount(125, 100), 1) == D("1.2")
+    assert round(Amount(150, 100)) == 2
+    assert Amount(125, 100).quantize(D("0.1")) == D("1.2")
+    assert Amount(125, 100).quantize(
+        D("0.1"), rounding=decimal.ROUND_HALF_UP) == D("1.3")
+    assert repr(Amount(1234, 100)) == "Amount(1234, 100)"
+
+
+def test_pickle_and_copy(Amount):
+    amount = Amount(-1234, 100)
+    amount.to_decimal()
+    restored = pickle.loads(pickle.dumps(amount))
+    assert (restored.numerator, restored.denominator) == (-1234, 100)
+    assert restored.to_decimal() == D("-12.34")
+    assert copy.copy(amount) is amount
+    assert copy.deepcopy(amount) is amount
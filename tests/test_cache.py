@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Books from the snapshot cache against parsed books
+
+import bookdump
+from conftest import BOOK_XML
+
+
+def test_cached_book(gnucashxml, reference, tmp_path):
+    cache = gnucashxml.BookCache(str(tmp_path / "cache"))
+    parsed = gnucashxml.from_filename(BOOK_XML, cache=cache)
+    identity = gnucashxml._file_identity(BOOK_XML)
+    assert cache.load(BOOK_XML, identity) is not None
+    cached = gnucashxml.from_filename(BOOK_XML, cache=cache)
+    assert cached is not parsed
+    assert bookdump.dump(parsed) == reference
+    assert bookdump.dump(cached) == reference
+    assert bookdump.dump_prices(cached) == bookdump.dump_prices(parsed)
+
+
+def test_cache_directory_name(gnucashxml, reference, tmp_path):
+    directory = str(tmp_path / "cache")
+    gnucashxml.from_filename(BOOK_XML, cache=directory)
+    cached = gnucashxml.from_filename(BOOK_XML, cache=directory)
+    assert bookdump.dump(cached) == reference
+
+
+def test_modified_file_parsed_again(gnucashxml, book_path, tmp_path):
+    cache = gnucashxml.BookCache(str(tmp_path / "cache"))
+    book = gnucashxml.from_filename(book_path, cache=cache)
+    description = book.transactions[0].description
+    with open(book_path) as fobj:
+        text = fobj.read()
+    with open(book_path, "w") as fobj:
+        fobj.write(text.replace(
+            "<trn:description>{}<".format(description.replace("&", "&amp;")),
+            "<trn:description>Changed<", 1))
+    book = gnucashxml.from_filename(book_path, cache=cache)
+    assert book.transactions[0].description == "Changed"
+    assert bookdump.dump(book) == bookdump.reference(book_path)
+
+
+def test_selective_parse_not_cached(gnucashxml, tmp_path):
+    directory = tmp_path / "cache"
+    gnucashxml.from_filename(BOOK_XML, cache=str(directory),
+                             accounts=["Groceries"])
+    assert not directory.exists() or not list(directory.iterdir())
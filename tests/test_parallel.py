@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Parses with a process pool against the reference reader
+
+import concurrent.futures
+import datetime
+
+import bookdump
+from conftest import BOOK_XML
+
+
+def test_workers(gnucashxml, reference):
+    book = gnucashxml.from_filename(BOOK_XML, workers=2)
+    assert bookdump.dump(book) == reference
+
+
+def test_workers_gzip(gnucashxml, reference, gzip_path):
+    book = gnucashxml.from_filename(gzip_path, workers=3)
+    assert bookdump.dump(book) == reference
+
+
+def test_workers_selective(gnucashxml):
+    options = dict(accounts=["Checking"], start_date=datetime.date(2022, 1, 1),
+                   end_date=datetime.date(2023, 12, 31))
+    serial = gnucashxml.from_filename(BOOK_XML, **options)
+    parallel = gnucashxml.from_filename(BOOK_XML, workers=2, **options)
+    assert bookdump.dump(parallel) == bookdump.dump(serial)
+
+
+def test_workers_without_slots(gnucashxml):
+    serial = gnucashxml.from_filename(BOOK_XML, load_slots=False)
+    parallel = gnucashxml.from_filename(BOOK_XML, workers=2,
+                                        load_slots=False)
+    assert bookdump.dump(parallel) == bookdump.dump(serial)
+    assert all(not trn.slots for trn in parallel.transactions)
+
+
+def test_book_cut_into_chunks(gnucashxml, reference, monkeypatch):
+    # The transactions are really handed to the pool, in several chunks
+    chunks = []
+
+    class Pool(concurrent.futures.ThreadPoolExecutor):
+        def map(self, fn, items, *iterables):
+            items = list(items)
+            chunks.extend(items)
+            return super().map(fn, items, *iterables)
+
+    monkeypatch.setattr(gnucashxml.concurrent.futures,
+                        "ProcessPoolExecutor", Pool)
+    book = gnucashxml.from_filename(BOOK_XML, workers=2)
+    assert len(chunks) > 2
+    assert bookdump.dump(book) == reference
@@ -0,0 +1,37 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# The iterparse reader against the reference reader
+
+import io
+
+import bookdump
+from conftest import BOOK_XML
+
+
+def test_from_filename(gnucashxml, reference):
+    assert bookdump.dump(gnucashxml.from_filename(BOOK_XML)) == reference
+
+
+def test_gzip(gnucashxml, reference, gzip_path):
+    assert bookdump.dump(gnucashxml.from_filename(gzip_path)) == reference
+
+
+def test_parse_file_object(gnucashxml, reference):
+    with open(BOOK_XML, "rb") as fobj:
+        data = fobj.read()
+    assert bookdump.dump(gnucashxml.parse(io.BytesIO(data))) == reference
+
+
+def test_utc_offsets(gnucashxml, reference):
+    # Equal datetimes may still differ in their offset
+    book = gnucashxml.from_filename(BOOK_XML)
+    for trn, (guid, currency, date, date_entered, *rest) in zip(
+            book.transactions, reference['transactions']):
+        assert trn.date.utcoffset() == date.utcoffset()
+        assert trn.date_entered.utcoffset() == date_entered.utcoffset()
+
+
+def test_template_transactions_skipped(gnucashxml, reference):
+    book = gnucashxml.from_filename(BOOK_XML)
+    assert len(book.transactions) == len(reference['transactions'])
+    assert all(trn.description != "Template" for trn in book.transactions)
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Book.query() against a scan of all splits
+
+import datetime
+
+import pytest
+
+from conftest import BOOK_XML
+
+START, END = datetime.date(2022, 2, 1), datetime.date(2023, 8, 31)
+
+
+def _all_splits(book):
+    return [split for trn in book.transactions for split in trn.splits]
+
+
+def _check(query, expected):
+    found = list(query.splits())
+    days = [split.transaction.date.date() for split in found]
+    assert days == sorted(days)
+    assert sorted(split.guid for split in found) == \
+        sorted(split.guid for split in expected)
+
+
+def _queries(book):
+    # (query, the condition its splits must meet)
+    taxes = book.find_account("Taxes")
+    subtree = {acc for acc, depth in taxes.traverse()}
+    return [
+        (book.query(), lambda split: True),
+        (book.query().accounts("Checking"),
+         lambda split: split.account.name == "Checking"),
+        (book.query().accounts("Expenses:Groceries", "Salary"),
+         lambda split: split.account.name in ("Groceries", "Salary")),
+        (book.query().subtree(taxes),
+         lambda split: split.account in subtree),
+        (book.query().types("STOCK", "MUTUAL"),
+         lambda split: split.account.actype in ("STOCK", "MUTUAL")),
+        (book.query().between(START, END),
+         lambda split: START <= split.transaction.date.date() <= END),
+        (book.query().between(end=END).accounts("Checking"),
+         lambda split: split.account.name == "Checking" and
+         split.transaction.date.date() <= END),
+        (book.query().reconciled('c', 'y'),
+         lambda split: split.reconciled_state in ('c', 'y')),
+        (book.query().subtree("Assets").amount(0, 500),
+         lambda split: split.account.fullname().startswith("Assets") and
+         0 <= split.value <= 500),
+    ]
+
+
+@pytest.mark.parametrize("number", range(9))
+def test_splits(gnucashxml, number):
+    book = gnucashxml.from_filename(BOOK_XML)
+    query, condition = _queries(book)[number]
+    expected = [split for split in _all_splits(book) if condition(split)]
+    assert expected
+    _check(query, expected)
+
+
+@pytest.mark.parametrize("number", range(9))
+def test_lazy_sqlite(gnucashxml, sqlite_path, number):
+    book = gnucashxml.from_sqlite(sqlite_path, lazy=True)
+    query, condition = _queries(book)[number]
+    found = list(query.splits())
+    expected = [split for split in _all_splits(book) if condition(split)]
+    _check(query, expected)
+    assert found
+
+
+def test_transactions(gnucashxml):
+    book = gnucashxml.from_filename(BOOK_XML)
+    query = book.query().subtree("Assets").between(START, END)
+    expected = {split.transaction.guid for split in query.splits()}
+    found = [trn.guid for trn in query.transactions()]
+    assert len(found) == len(set(found))
+    assert set(found) == expected
@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# diff() and Book.reload() after the file was changed
+
+import os
+import re
+import uuid
+
+import bookdump
+
+TRANSACTION = re.compile(r'<gnc:transaction version.*?</gnc:transaction>\n',
+                         re.S)
+
+
+def _rewrite(path, change):
+    # Write change(text) to path, with a later modification time
+    with open(path) as fobj:
+        text = fobj.read()
+    st = os.stat(path)
+    with open(path, "w") as fobj:
+        fobj.write(change(text))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+
+
+def test_unchanged_file(gnucashxml, book_path):
+    book = gnucashxml.from_filename(book_path)
+    assert not book.reload()
+    assert not gnucashxml.diff(book, gnucashxml.from_filename(book_path))
+
+
+def test_modified_transaction(gnucashxml, book_path):
+    book = gnucashxml.from_filename(book_path)
+    first, second = book.transactions[:2]
+    split = second.splits[0]
+    old_value = "<split:value>{}/{}</split:value>".format(
+        split.value.numerator, split.value.denominator)
+
+    def change(text):
+        blocks = TRANSACTION.findall(text)
+        return text.replace(blocks[1], blocks[1].replace(
+            old_value, "<split:value>1/100</split:value>", 1))
+    _rewrite(book_path, change)
+
+    changes = book.reload()
+    assert [(old.guid, new.guid) for old, new
+            in changes.modified_transactions] == [(second.guid, second.guid)]
+    assert not changes.added_transactions
+    assert not changes.removed_transactions
+    assert book.transactions[0] is first
+    assert bookdump.dump(book) == bookdump.reference(book_path)
+
+
+def test_added_and_removed_transactions(gnucashxml, book_path):
+    book = gnucashxml.from_filename(book_path)
+    removed = book.transactions[0]
+    copied = book.transactions[1]
+
+    def change(text):
+        blocks = TRANSACTION.findall(text)
+        # A copy of the second transaction with new guids, added after
+        # the last one, so the count stays the same
+        added = re.sub(r'(<(?:trn|split):id type="guid">)[0-9a-f]{32}',
+                       lambda m: m.group(1) + uuid.uuid4().hex, blocks[1])
+        text = text.replace(blocks[0], "")
+        return text.replace("<gnc:template-transactions>",
+                            added + "<gnc:template-transactions>")
+    _rewrite(book_path, change)
+
+    changes = book.reload()
+    assert [trn.guid for trn in changes.removed_transactions] == \
+        [removed.guid]
+    assert [trn.description for trn in changes.added_transactions] == \
+        [copied.description]
+    assert not changes.modified_transactions
+    assert removed not in book.transactions
+    assert bookdump.dump(book) == bookdump.reference(book_path)
+
+
+def test_modified_account(gnucashxml, book_path):
+    book = gnucashxml.from_filename(book_path)
+    _rewrite(book_path, lambda text: text.replace(
+        "<act:name>Groceries</act:name>", "<act:name>Food</act:name>"))
+    changes = book.reload()
+    assert [new.name for old, new in changes.modified_accounts] == ["Food"]
+    assert not changes.modified_transactions
+    assert book.find_account("Food") is not None
+    assert bookdump.dump(book) == bookdump.reference(book_path)
+
+
+def test_modified_slot(gnucashxml, book_path):
+    book = gnucashxml.from_filename(book_path)
+    trn = next(trn for trn in book.transactions if 'notes' in trn.slots)
+    note = trn.slots['notes']
+    _rewrite(book_path, lambda text: text.replace(
+        ">{}<".format(note), ">changed<", 1))
+    changes = book.reload()
+    assert [old.guid for old, new in changes.modified_transactions] == \
+        [trn.guid]
+    assert bookdump.dump(book) == bookdump.reference(book_path)
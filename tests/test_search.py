@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Book.search() against a scan of all transactions
+
+import re
+
+import pytest
+
+from conftest import BOOK_XML
+
+FIELDS = ('description', 'num', 'memo')
+
+
+@pytest.fixture(scope="module")
+def book(gnucashxml):
+    return gnucashxml.from_filename(BOOK_XML)
+
+
+def _texts(trn, fields):
+    for field in fields:
+        if field == 'memo':
+            texts = [split.memo for split in trn.splits]
+        else:
+            texts = [getattr(trn, field)]
+        for text in texts:
+            if text:
+                yield text.casefold()
+
+
+def _scan(book, matches, fields=FIELDS, limit=None):
+    found = [trn for trn in book.transactions
+             if any(matches(text) for text in _texts(trn, fields))]
+    return sorted(found, key=lambda trn: trn.date)[:limit]
+
+
+@pytest.mark.parametrize("text", ["grocery", "Co", "& co", "memo 1", "4",
+                                  "pay", "IRS", "no such text"])
+def test_substring(book, text):
+    expected = _scan(book, lambda found: text.casefold() in found)
+    assert book.search(text) == expected
+
+
+@pytest.mark.parametrize("text", ["groc", "buy v", "memo", "pay", "co gro"])
+def test_prefix(book, text):
+    words = text.casefold().split()
+
+    def matches(trn):
+        found = [word for found in _texts(trn, FIELDS)
+                 for word in re.findall(r"\w+", found)]
+        return all(any(word.startswith(prefix) for word in found)
+                   for prefix in words)
+    expected = sorted([trn for trn in book.transactions if matches(trn)],
+                      key=lambda trn: trn.date)
+    assert book.search(text, prefix=True) == expected
+
+
+def test_fields_and_limit(book):
+    expected = _scan(book, lambda found: "memo" in found, fields=('memo',))
+    assert expected
+    assert book.search("memo", fields=['memo']) == expected
+    assert book.search("memo", fields=['description']) == []
+    assert book.search("memo", limit=3) == expected[:3]
+    with pytest.raises(ValueError):
+        book.search("memo", fields=['payee'])
+
+
+def test_index_rebuilt_after_changes(gnucashxml):
+    book = gnucashxml.from_filename(BOOK_XML, search_index=True)
+    trn = book.transactions[0]
+    trn.description = "Unusual description"
+    book.build_search_index()
+    assert book.search("unusual") == [trn]
+    book.transactions.remove(trn)
+    for split in trn.splits:
+        split.account.splits.remove(split)
+    assert book.search("unusual") == []
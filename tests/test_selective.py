@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Selective parses against the full book filtered afterwards
+
+import datetime
+
+import pytest
+
+import bookdump
+from conftest import BOOK_XML
+
+
+def _accounts(reference, *names):
+    # guids of the accounts with one of the names
+    return {guid for guid, fields in reference['accounts'].items()
+            if fields[0] in names}
+
+
+def _in_accounts(guids):
+    return lambda trn: any(split[6] in guids for split in trn[-1])
+
+
+def _posted(start, end):
+    return lambda trn: start <= trn[2].date() <= end
+
+
+@pytest.mark.parametrize("accounts", [
+    ["Groceries"], ["Expenses:Groceries"], "guid"])
+def test_accounts(gnucashxml, reference, accounts):
+    guids = _accounts(reference, "Groceries")
+    if accounts == "guid":
+        accounts = list(guids)
+    book = gnucashxml.from_filename(BOOK_XML, accounts=accounts)
+    expected = bookdump.select(reference, _in_accounts(guids))
+    assert expected['transactions']
+    assert bookdump.dump(book) == expected
+
+
+def test_subaccounts(gnucashxml, reference):
+    book = gnucashxml.from_filename(BOOK_XML, accounts=["Taxes"],
+                                    include_subaccounts=True)
+    guids = _accounts(reference, "Taxes", "Federal US")
+    assert bookdump.dump(book) == bookdump.select(reference,
+                                                  _in_accounts(guids))
+    book = gnucashxml.from_filename(BOOK_XML, accounts=["Taxes"])
+    assert book.transactions == []
+
+
+def test_account_types(gnucashxml, reference):
+    book = gnucashxml.from_filename(BOOK_XML, account_types=["STOCK",
+                                                             "MUTUAL"])
+    guids = _accounts(reference, "VTI", "FXAIX")
+    assert bookdump.dump(book) == bookdump.select(reference,
+                                                  _in_accounts(guids))
+
+
+def test_accounts_and_types(gnucashxml, reference):
+    book = gnucashxml.from_filename(BOOK_XML, accounts=["VTI", "Groceries"],
+                                    account_types=["STOCK"])
+    guids = _accounts(reference, "VTI")
+    assert bookdump.dump(book) == bookdump.select(reference,
+                                                  _in_accounts(guids))
+
+
+def test_dates(gnucashxml, reference):
+    start, end = datetime.date(2022, 3, 1), datetime.date(2023, 6, 30)
+    book = gnucashxml.from_filename(BOOK_XML, start_date=start,
+                                    end_date=end)
+    expected = bookdump.select(reference, _posted(start, end))
+    assert 0 < len(expected['transactions']) < len(reference['transactions'])
+    assert bookdump.dump(book) == expected
+
+
+def test_open_date_range(gnucashxml, reference):
+    start = datetime.datetime(2023, 1, 1, 12, 0)
+    book = gnucashxml.from_filename(BOOK_XML, start_date=start)
+    expected = bookdump.select(reference, _posted(start.date(),
+                                                  datetime.date.max))
+    assert bookdump.dump(book) == expected
+
+
+def test_accounts_and_dates(gnucashxml, reference):
+    start, end = datetime.date(2021, 1, 1), datetime.date(2022, 12, 31)
+    book = gnucashxml.from_filename(BOOK_XML, accounts=["Checking"],
+                                    start_date=start, end_date=end)
+    in_accounts = _in_accounts(_accounts(reference, "Checking"))
+    posted = _posted(start, end)
+    expected = bookdump.select(
+        reference, lambda trn: in_accounts(trn) and posted(trn))
+    assert bookdump.dump(book) == expected
@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Slots are plain dicts of each object's own, whether or not it has any
+
+import pytest
+
+from conftest import BOOK_XML
+
+
+@pytest.fixture
+def book(gnucashxml):
+    return gnucashxml.from_filename(BOOK_XML)
+
+
+def _slotless(book):
+    root = book.root_account
+    trn = next(trn for trn in book.transactions if not trn.slots)
+    split = next(split for split in trn.splits if not split.slots)
+    return [root, trn, split]
+
+
+def test_slotless_objects_mutable(book):
+    objects = _slotless(book)
+    other = [trn for trn in book.transactions if not trn.slots][1]
+    for number, obj in enumerate(objects):
+        assert obj.slots == {}
+        obj.slots['notes'] = number
+        obj.slots.update(color='red')
+        assert obj.slots == {'notes': number, 'color': 'red'}
+    # Each object got a dict of its own
+    for number, obj in enumerate(objects):
+        assert obj.slots['notes'] == number
+    assert other.slots == {}
+
+
+def test_new_objects_mutable(gnucashxml):
+    first = gnucashxml.Transaction(guid="1")
+    second = gnucashxml.Transaction(guid="2")
+    first.slots['notes'] = "first"
+    assert second.slots == {}
+    second.slots = None
+    second.slots['notes'] = "second"
+    assert first.slots == {'notes': "first"}
+
+
+def test_empty_frame_mutable(book):
+    options = book.slots['options']
+    assert options['Budgeting'] == {}
+    options['Budgeting']['period'] = 'month'
+    assert book.slots['options']['Budgeting'] == {'period': 'month'}
+
+
+def test_slots_with_load_slots_false(gnucashxml):
+    book = gnucashxml.from_filename(BOOK_XML, load_slots=False)
+    trn = book.transactions[0]
+    assert book.slots == {} and trn.slots == {}
+    book.slots['key'] = 1
+    trn.slots['key'] = 2
+    assert book.slots == {'key': 1}
+    assert trn.slots == {'key': 2}
+    assert book.transactions[1].slots == {}
+
+
+def test_cached_book_slots_mutable(gnucashxml, tmp_path):
+    directory = str(tmp_path / "cache")
+    gnucashxml.from_filename(BOOK_XML, cache=directory)
+    book = gnucashxml.from_filename(BOOK_XML, cache=directory)
+    root, trn, split = _slotless(book)
+    root.slots['key'] = 1
+    split.slots['key'] = 2
+    assert root.slots == {'key': 1} and split.slots == {'key': 2}
+    book.slots['options']['Budgeting']['period'] = 'month'
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+# -------------------------------------------------------------------------------------------
+# Books read from SQLite against the reference reader
+#
+# GnuCash stores times in UTC in SQL and transactions in no particular
+# order, so books are compared with bookdump.unordered().
+
+import datetime
+
+import pytest
+
+import bookdump
+from conftest import BOOK_XML
+
+
+@pytest.fixture(scope="module")
+def expected(reference):
+    return bookdump.unordered(reference)
+
+
+def test_from_sqlite(gnucashxml, expected, sqlite_path):
+    book = gnucashxml.from_sqlite(sqlite_path)
+    assert bookdump.unordered(bookdump.dump(book)) == expected
+
+
+def test_format_detected(gnucashxml, expected, sqlite_path):
+    book = gnucashxml.from_filename(sqlite_path)
+    assert bookdump.unordered(bookdump.dump(book)) == expected
+
+
+def test_lazy(gnucashxml, expected, sqlite_path):
+    book = gnucashxml.from_sqlite(sqlite_path, lazy=True)
+    assert bookdump.unordered(bookdump.dump(book)) == expected
+
+
+def test_lazy_balances(gnucashxml, sqlite_path):
+    xml = gnucashxml.from_filename(BOOK_XML)
+    book = gnucashxml.from_sqlite(sqlite_path, lazy=True)
+    as_of = datetime.datetime(2022, 12, 31, tzinfo=datetime.timezone.utc)
+    for name in ("Checking", "Groceries", "VTI"):
+        assert book.find_account(name).balance_as_of(as_of) == \
+            xml.find_account(name).balance_as_of(as_of)
+
+
+def test_prices(gnucashxml, sqlite_path):
+    xml = gnucashxml.from_filename(BOOK_XML)
+    book = gnucashxml.from_sqlite(sqlite_path)
+    assert sorted(bookdump.dump_prices(book)) == \
+        sorted(bookdump.dump_prices(xml))
+
+
+def test_selection(gnucashxml, sqlite_path):
+    options = dict(accounts=["Checking"], start_date=datetime.date(2022, 1, 1),
+                   end_date=datetime.date(2023, 6, 30))
+    xml = gnucashxml.from_filename(BOOK_XML, **options)
+    book = gnucashxml.from_sqlite(sqlite_path, **options)
+    assert xml.transactions
+    assert bookdump.unordered(bookdump.dump(book)) == \
+        bookdump.unordered(bookdump.dump(xml))
+
+
+def test_selection_not_lazy(gnucashxml, sqlite_path):
+    with pytest.raises(ValueError):
+        gnucashxml.from_sqlite(sqlite_path, lazy=True, accounts=["Checking"])
+
+
+@pytest.mark.parametrize("options", [{}, {'lazy': True},
+                                     {'load_slots': False}])
+def test_slots_mutable(gnucashxml, sqlite_path, options):
+    book = gnucashxml.from_sqlite(sqlite_path, **options)
+    trn = next(trn for trn in book.transactions if not trn.slots)
+    trn.slots['notes'] = "added"
+    book.root_account.slots['key'] = 1
+    assert trn.slots == {'notes': "added"}
+    assert book.root_account.slots == {'key': 1}
+    if not options:
+        assert book.slots['options']['Budgeting'] == {}
+        book.slots['options']['Budgeting']['period'] = 'month'